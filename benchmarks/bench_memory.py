@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import statistics
+import subprocess
+
+# Add the parent directory to the system path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from memory.chroma_db_manager import TuringMemory
+
+# ==========================================
+# HELPERS
+# ==========================================
+def seed_store(db_path: str, messages: int):
+    """Fills a scratch store with a realistic single-session chat log."""
+    memory = TuringMemory(db_path=db_path)
+    for i in range(messages):
+        role = "user" if i % 2 == 0 else "turing"
+        memory.save_memory("bench_session", role, f"Benchmark message {i}: how do I configure service {i % 37}?")
+    del memory
+
+def summarize(samples: list) -> dict:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+# ==========================================
+# STARTUP
+# ==========================================
+def probe(kind: str, db_path: str) -> dict:
+    """
+    One cold measurement, run in a fresh interpreter by cold_run(): the embedding model
+    and Chroma's per-path client are process-wide, so a second open in the same process is warm.
+    """
+    if kind.startswith("seed:"):
+        seed_store(db_path, int(kind.split(":", 1)[1]))
+        return {}
+
+    if kind == "sync":
+        started = time.perf_counter()
+        TuringMemory(db_path=db_path, warm_sessions=["bench_session"])
+        return {"sync_open": time.perf_counter() - started}
+
+    if kind == "background":
+        started = time.perf_counter()
+        memory = TuringMemory(background=True, db_path=db_path, warm_sessions=["bench_session"])
+        ctor = time.perf_counter() - started
+        memory.wait_ready()
+        return {"background_ctor": ctor, "background_ready": time.perf_counter() - started}
+
+    # Time from TuringSidebar() to the window being shown (offscreen, PyQt6 required)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from ui.sidebar import TuringSidebar
+
+    app = QApplication(sys.argv)
+    started = time.perf_counter()
+    sidebar = TuringSidebar(db_path=db_path)
+    sidebar.show()
+    app.processEvents()
+    shown = time.perf_counter() - started
+    sidebar.memory.wait_ready()
+    sidebar.close()
+    return {"sidebar_shown": shown}
+
+def cold_run(kind: str, db_path: str) -> dict:
+    """Runs probe() in a child process (which also releases the store lock when it exits)."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--probe", kind, "--db", db_path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{kind} probe failed: {result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+# ==========================================
+# STARTUP
+# ==========================================
+def bench_startup(db_path: str, runs: int) -> dict:
+    """
+    Every sample is a cold start in its own process:
+    sync_open:        TuringMemory() as the sidebar used to build it (blocks the UI thread)
+    background_ctor:  time until TuringMemory(background=True) returns control to the UI
+    background_ready: time until the background boot resolves `ready`
+    """
+    samples = {"sync_open": [], "background_ctor": [], "background_ready": []}
+    for _ in range(runs):
+        for kind in ("sync", "background"):
+            for name, seconds in cold_run(kind, db_path).items():
+                samples[name].append(seconds)
+    return {name: summarize(values) for name, values in samples.items()}
+
+# ==========================================
+# EXPORT / IMPORT
+# ==========================================
+def bench_export_import(db_path: str, workdir: str, runs: int) -> dict:
+    """Throughput of the .tmem export and of re-importing it into an empty store."""
+    memory = TuringMemory(db_path=db_path)
+    export_path = os.path.join(workdir, "bench.tmem")
+    records = memory.collection.count()
+    store_bytes = sum(
+        os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(db_path) for name in files
+    )
+
+    exports, imports = [], []
+    for run in range(runs):
+        exports.append(memory.export_to(export_path)["seconds"])
+        target = TuringMemory(db_path=os.path.join(workdir, f"import_{run}"))
+        imports.append(target.import_from(export_path)["seconds"])
+
+    file_bytes = os.path.getsize(export_path)
+    return {
+        "export": {**summarize(exports), "records_per_s": round(records / statistics.median(exports))},
+        "import": {**summarize(imports), "records_per_s": round(records / statistics.median(imports))},
+        "size": {"records": records, "store_mb": round(store_bytes / 1e6, 2), "export_mb": round(file_bytes / 1e6, 2)},
+    }
+
+def bench_sidebar_boot(db_path: str, runs: int) -> dict:
+    """Cold sidebar boots against the benchmark store (never the user's own)."""
+    return {"sidebar_shown": summarize([cold_run("sidebar", db_path)["sidebar_shown"] for _ in range(runs)])}
+
+# ==========================================
+# ENTRY POINT
+# ==========================================
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Turing memory benchmarks.")
+    parser.add_argument("--db", help="Benchmark a copy of an existing store instead of a seeded scratch store")
+    parser.add_argument("--seed", type=int, default=500, help="Messages in the scratch store")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sidebar", action="store_true", help="Also time the full sidebar boot")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--probe", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        # Child of cold_run(): measure once on --db in place and report on stdout
+        print(json.dumps(probe(args.probe, args.db)))
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix="turing_bench_")
+    db_path = os.path.join(workdir, "chroma_data")
+    try:
+        if args.db:
+            shutil.copytree(args.db, db_path)
+        else:
+            print(f"Seeding scratch store with {args.seed} messages...")
+            # In a child too: this process must not hold the store lock while the probes run
+            cold_run(f"seed:{args.seed}", db_path)
+
+        results = {"startup": bench_startup(db_path, args.runs)}
+        if args.sidebar:
+            results["startup"].update(bench_sidebar_boot(db_path, args.runs))
+        # Last: it opens the store in this process
+        results["export_import"] = bench_export_import(db_path, workdir, args.runs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for section, metrics in results.items():
+        print(f"\n[{section}]")
+        for name, stats in metrics.items():
+            line = "  ".join(f"{key}={value}" for key, value in stats.items())
+            print(f"  {name:20} {line}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+import math
+import time
+import uuid
+import queue
+import threading
+
+# Defaults for the "streaming" block of config.json
+DEFAULT_STREAMING = {
+    "token_batch_ms": 30,   # tokens are published in batches at most this often
+    "queue_size": 256,      # per-subscriber bound on undelivered events
+    "block_timeout": 5.0,   # how long a full blocking subscriber may stall a generation
+    "console": False,       # echo every generation to the terminal (Rich)
+    "jsonl_log": None,      # path of a JSONL trace of every generation event
+}
+
+# Event kinds
+START = "start"
+TOKENS = "tokens"
+METRICS = "metrics"
+DONE = "done"
+ERROR = "error"
+CONTROL_KINDS = (START, METRICS, DONE, ERROR)
+
+_CLOSE = object()
+
+
+class GenerationEvent:
+    __slots__ = ("kind", "generation_id", "data", "timestamp")
+
+    def __init__(self, kind, generation_id, data=None):
+        self.kind = kind
+        self.generation_id = generation_id
+        self.data = data or {}
+        self.timestamp = time.time()
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "generation_id": self.generation_id, "timestamp": self.timestamp, **self.data}
+
+
+class Subscription:
+    def __init__(self, bus, handler, name, kinds=None, generation_id=None, maxsize=None, blocking=True,
+                 block_timeout=None):
+        """
+        One consumer of the bus, with its own bounded queue and dispatcher thread,
+        so a slow consumer never delays the others.
+        blocking=True  -> a full queue makes the publisher wait (up to block_timeout): backpressure.
+        blocking=False -> token batches are dropped while the queue is full; control events never are.
+        block_timeout=math.inf makes the publisher wait as long as it takes (the UI's own stream).
+        """
+        self.bus = bus
+        self.handler = handler
+        self.name = name
+        self.kinds = set(kinds) if kinds else None
+        self.generation_id = generation_id
+        self.blocking = blocking
+        self.block_timeout = block_timeout if block_timeout is not None else bus.block_timeout
+        self.stats = {"delivered": 0, "dropped": 0, "errors": 0}
+
+        self._queue = queue.Queue(maxsize=maxsize or bus.queue_size)
+        self._thread = threading.Thread(target=self._dispatch, name=f"turing-bus-{name}", daemon=True)
+        self._thread.start()
+
+    def wants(self, event: GenerationEvent) -> bool:
+        if self.generation_id is not None and event.generation_id != self.generation_id:
+            return False
+        return self.kinds is None or event.kind in self.kinds
+
+    def offer(self, event: GenerationEvent):
+        if not self.blocking and event.kind not in CONTROL_KINDS:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self.stats["dropped"] += 1
+            return
+        if self.block_timeout == math.inf:
+            self._queue.put(event)
+            return
+        try:
+            self._queue.put(event, timeout=self.block_timeout)
+        except queue.Full:
+            # A stuck consumer must not hang generation for everyone else
+            self.stats["dropped"] += 1
+
+    def _dispatch(self):
+        while True:
+            event = self._queue.get()
+            if event is _CLOSE:
+                return
+            try:
+                self.handler(event)
+                self.stats["delivered"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[Event Bus] Subscriber '{self.name}' failed on {event.kind}: {e}")
+
+    def close(self, wait: bool = False):
+        """Stops the dispatcher once everything already queued has been delivered."""
+        self.bus.unsubscribe(self)
+        self._queue.put(_CLOSE)
+        if wait:
+            self._thread.join()
+
+
+class EventBus:
+    def __init__(self, queue_size: int = None, block_timeout: float = None):
+        """In-process publish/subscribe bus for generation events."""
+        self.queue_size = queue_size or DEFAULT_STREAMING["queue_size"]
+        self.block_timeout = block_timeout if block_timeout is not None else DEFAULT_STREAMING["block_timeout"]
+        self._subscriptions = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler, name="subscriber", kinds=None, generation_id=None, maxsize=None, blocking=True,
+                  block_timeout=None) -> Subscription:
+        subscription = Subscription(self, handler, name, kinds, generation_id, maxsize, blocking, block_timeout)
+        with self._lock:
+            # Copy-on-write: publish() iterates a snapshot without taking the lock
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def publish(self, event: GenerationEvent):
+        for subscription in self._subscriptions:
+            if subscription.wants(event):
+                subscription.offer(event)
+
+
+def stream_generation(bus: EventBus, engine, prompt: str = None, profile: str = "chat", meta: dict = None,
+                      generation_id: str = None, direct_text: str = None, token_batch_ms: float = None) -> str:
+    """
+    Runs one generation and publishes it on the bus: start, batched tokens, metrics, then done or error.
+    Chunks are kept in a single list and joined once, so every subscriber shares the same final text.
+    direct_text publishes a ready answer (e.g. a skill result) through the same pipeline without the LLM.
+    Returns the final text.
+    """
+    generation_id = generation_id or uuid.uuid4().hex[:12]
+    if token_batch_ms is None:
+        token_batch_ms = engine.config.get("streaming", {}).get("token_batch_ms", DEFAULT_STREAMING["token_batch_ms"])
+    interval = token_batch_ms / 1000.0
+    model = engine.model_for(profile) if direct_text is None else None
+
+    bus.publish(GenerationEvent(START, generation_id, {"profile": profile, "model": model, "meta": meta or {}}))
+    started = time.perf_counter()
+    first_token = None
+    chunks, pending, batches = [], [], 0
+    last_flush = started
+
+    def flush():
+        nonlocal pending, last_flush, batches
+        if pending:
+            bus.publish(GenerationEvent(TOKENS, generation_id, {"text": "".join(pending), "chunks": len(pending)}))
+            batches += 1
+            pending = []
+        last_flush = time.perf_counter()
+
+    try:
+        source = [direct_text] if direct_text is not None else engine.stream_response(prompt, profile=profile)
+        for chunk in source:
+            if not chunk:
+                continue
+            if direct_text is None and chunk.startswith("[System Error]"):
+                # The engine reports failures in-band as a final chunk
+                raise RuntimeError(chunk)
+            if first_token is None:
+                first_token = time.perf_counter()
+            chunks.append(chunk)
+            pending.append(chunk)
+            if time.perf_counter() - last_flush >= interval:
+                flush()
+        flush()
+    except Exception as e:
+        flush()
+        message = str(e) if str(e).startswith("[System Error]") else f"[System Error] {e}"
+        bus.publish(GenerationEvent(ERROR, generation_id, {"error": message, "text": "".join(chunks), "meta": meta or {}}))
+        return message
+
+    text = "".join(chunks)
+    duration = time.perf_counter() - started
+    streaming = duration - ((first_token or started) - started)
+    bus.publish(GenerationEvent(METRICS, generation_id, {
+        "profile": profile,
+        "model": model,
+        "ttft": round((first_token or started) - started, 4),
+        "seconds": round(duration, 4),
+        "chunks": len(chunks),
+        "batches": batches,
+        "chars": len(text),
+        "chunks_per_second": round(len(chunks) / streaming, 1) if streaming > 0 else None,
+    }))
+    bus.publish(GenerationEvent(DONE, generation_id, {"text": text, "meta": meta or {}}))
+    return text
+
+
+_shared_bus = None
+_shared_lock = threading.Lock()
+
+
+def get_event_bus(settings: dict = None) -> EventBus:
+    """One bus per process, so every window, logger and recorder sees the same generations."""
+    global _shared_bus
+    with _shared_lock:
+        if _shared_bus is None:
+            options = dict(DEFAULT_STREAMING)
+            options.update(settings or {})
+            _shared_bus = EventBus(options["queue_size"], options["block_timeout"])
+        return _shared_bus
@@ -1,9 +1,16 @@
 import os
 import sys
 import json
+import threading
 from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage, SystemMessage
 
+# Profile used when a caller does not ask for one
+DEFAULT_PROFILE = "chat"
+
+# Profile keys that are passed straight through to ChatOllama
+PROFILE_OPTIONS = ("num_predict", "num_ctx", "stop", "keep_alive")
+
 class TuringLLMEngine:
     def __init__(self):
         """
@@ -27,14 +34,19 @@ class TuringLLMEngine:
         # Extract settings from config
         self.model_name = self.config["model"]["active_llm"]
         self.temperature = self.config["model"]["temperature"]
+
+        # Upper bound on simultaneous requests to Ollama from this engine (batch tools share it)
+        self.max_concurrency = max(1, int(self.config["model"].get("max_concurrency", 2)))
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
         
+        # Named generation profiles (chat, shell, spotlight, ...) each get their own client
+        self.profiles = self.config.get("profiles", {})
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+
         try:
             # Connect to the local Ollama background service
-            self.llm = ChatOllama(
-                model=self.model_name,
-                temperature=self.temperature,
-                base_url="http://localhost:11434"
-            )
+            self.llm = self.get_client(DEFAULT_PROFILE)
         except Exception as e:
             print(f"CRITICAL: Failed to bind to Ollama engine. {e}")
             sys.exit(1)
@@ -48,7 +60,36 @@ class TuringLLMEngine:
             )
         )
 
-    def generate_response(self, prompt: str) -> str:
+    def profile_settings(self, profile: str = DEFAULT_PROFILE) -> dict:
+        """
+        Resolves a profile from config.json. Missing keys fall back to the
+        global model settings, unknown profiles fall back to the chat profile.
+        """
+        settings = {"model": self.model_name, "temperature": self.temperature}
+        # Named profiles inherit from the model section only, never from another profile
+        settings.update(self.profiles.get(profile if profile in self.profiles else DEFAULT_PROFILE, {}))
+        return settings
+
+    def model_for(self, profile: str = DEFAULT_PROFILE) -> str:
+        return self.profile_settings(profile)["model"]
+
+    def get_client(self, profile: str = DEFAULT_PROFILE):
+        """Returns the cached ChatOllama client for a profile, creating it on first use."""
+        with self._clients_lock:
+            client = self._clients.get(profile)
+            if client is None:
+                settings = self.profile_settings(profile)
+                options = {key: settings[key] for key in PROFILE_OPTIONS if settings.get(key) is not None}
+                client = ChatOllama(
+                    model=settings["model"],
+                    temperature=settings["temperature"],
+                    base_url="http://localhost:11434",
+                    **options
+                )
+                self._clients[profile] = client
+            return client
+
+    def generate_response(self, prompt: str, profile: str = DEFAULT_PROFILE) -> str:
         """
         Sends a single query to the AI and returns the complete text.
         Used for background OS tasks and one-shot commands.
@@ -58,12 +99,14 @@ class TuringLLMEngine:
             HumanMessage(content=prompt)
         ]
         try:
-            response = self.llm.invoke(messages)
+            llm = self.get_client(profile)
+            with self._slots:
+                response = llm.invoke(messages)
             return response.content
         except Exception as e:
             return f"[System Error] Failed to compute response: {str(e)}"
 
-    def stream_response(self, prompt: str):
+    def stream_response(self, prompt: str, profile: str = DEFAULT_PROFILE):
         """
         Streams the response token-by-token.
         This is critical for our PyQt6 GUI so the user doesn't feel lag
@@ -74,8 +117,10 @@ class TuringLLMEngine:
             HumanMessage(content=prompt)
         ]
         try:
-            for chunk in self.llm.stream(messages):
-                yield chunk.content
+            llm = self.get_client(profile)
+            with self._slots:
+                for chunk in llm.stream(messages):
+                    yield chunk.content
         except Exception as e:
             yield f"[System Error] {str(e)}"
 
@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import threading
+
+# Add the parent directory to the system path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.event_bus import DEFAULT_STREAMING, START, TOKENS, METRICS, DONE, ERROR
+
+
+class ConsoleSubscriber:
+    """Mirrors generations to the terminal with Rich (headless runs, debugging a UI)."""
+
+    def __init__(self, console=None):
+        from rich.console import Console
+        from rich.markup import escape
+        self.console = console or Console()
+        self.escape = escape
+
+    def __call__(self, event):
+        if event.kind == START:
+            source = event.data["meta"].get("source", event.data["profile"])
+            self.console.print(f"\n[bold cyan]Turing ({self.escape(source)}):[/bold cyan] ", end="")
+        elif event.kind == TOKENS:
+            self.console.print(event.data["text"], end="", markup=False, highlight=False)
+        elif event.kind == METRICS:
+            self.console.print(
+                f"\n[dim]{event.data['chars']} chars in {event.data['seconds']:.2f}s "
+                f"(first token {event.data['ttft']:.2f}s, {event.data['batches']} batches)[/dim]"
+            )
+        elif event.kind == ERROR:
+            # Errors quote paths and tracebacks: "[/tmp]" must print as text, not close a tag
+            self.console.print(f"\n[bold red]{self.escape(event.data['error'])}[/bold red]", highlight=False)
+
+
+class JsonlLogSubscriber:
+    """Appends every event as one JSON line: a trace of all generations for later analysis."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8", buffering=1 << 16)
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            if event.kind in (DONE, ERROR):
+                # Token lines are buffered; a finished generation is always on disk
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class MemoryRecorder:
+    """
+    Persists finished chat turns to TuringMemory from the bus, off the UI and generation threads.
+    Only generations whose meta carries {"persist": True, "session_id", "user_text"} are stored.
+    """
+
+    def __init__(self, memory):
+        self.memory = memory
+
+    def __call__(self, event):
+        meta = event.data.get("meta", {})
+        if not meta.get("persist"):
+            return
+        user_seq, turing_seq = meta.get("seqs") or (None, None)
+        # A failed generation is stored as the user saw it: partial answer plus the error
+        text = event.data["text"] if event.kind == DONE else event.data["text"] + event.data["error"]
+        self.memory.save_memory(meta["session_id"], "user", meta["user_text"], seq=user_seq)
+        self.memory.save_memory(meta["session_id"], "turing", text, seq=turing_seq)
+
+
+def attach_default_subscribers(bus, settings: dict = None) -> list:
+    """Subscribes the console/JSONL tracers enabled in the "streaming" config block."""
+    options = dict(DEFAULT_STREAMING)
+    options.update(settings or {})
+    subscriptions = []
+    if options["console"]:
+        subscriptions.append(bus.subscribe(ConsoleSubscriber(), name="console"))
+    if options["jsonl_log"]:
+        path = options["jsonl_log"]
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), path)
+        subscriptions.append(bus.subscribe(JsonlLogSubscriber(path), name="jsonl-log"))
+    return subscriptions
+
+
+# Test the module
+if __name__ == "__main__":
+    from core.llm_engine import TuringLLMEngine
+    from core.event_bus import get_event_bus, stream_generation
+
+    engine = TuringLLMEngine()
+    bus = get_event_bus(engine.config.get("streaming"))
+    console = bus.subscribe(ConsoleSubscriber(), name="console")
+    attach_default_subscribers(bus, {"jsonl_log": engine.config.get("streaming", {}).get("jsonl_log")})
+
+    stream_generation(bus, engine, "In one sentence, what is an event bus?", meta={"source": "test"})
+    console.close(wait=True)
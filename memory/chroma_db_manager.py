@@ -1,34 +1,305 @@
 import os
+import json
+import time
+import threading
+try:
+    import fcntl
+except ImportError: # Not on Linux: no cross-process guard
+    fcntl = None
 import chromadb
 from chromadb.config import Settings
+from concurrent.futures import Future
 import datetime
 
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(ROOT_DIR, "core", "config.json")
+
+# Written into the store once messages saved before per-session seqs existed have been numbered
+SEQ_BACKFILL_MARKER = "seq_backfill.done"
+CHAT_ROLES = ("user", "turing")
+
+# Chroma does not support several processes writing one store, so the first
+# TuringMemory in a process takes an exclusive lock on it for the process lifetime
+STORE_LOCK = ".turing.lock"
+_store_locks = {}
+_store_locks_guard = threading.Lock()
+
+class MemoryBusyError(RuntimeError):
+    pass
+
+def load_memory_config() -> dict:
+    """Returns the "memory" section of config.json (empty if unreadable)."""
+    try:
+        with open(CONFIG_PATH, "r") as f:
+            return json.load(f).get("memory", {})
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def resolve_db_path(memory_config: dict = None) -> str:
+    """
+    The single source of truth for where the vector store lives.
+    Relative paths in config.json are resolved against the project root.
+    """
+    if memory_config is None:
+        memory_config = load_memory_config()
+    path = memory_config.get("vector_db_path", "./memory/chroma_data")
+    return os.path.normpath(path if os.path.isabs(path) else os.path.join(ROOT_DIR, path))
+
+def _lock_path(db_path: str) -> str:
+    return os.path.join(os.path.normpath(db_path), STORE_LOCK)
+
+def acquire_store_lock(db_path: str):
+    """Claims the store for this process (idempotent). Raises MemoryBusyError if another process has it."""
+    if fcntl is None:
+        return
+    path = _lock_path(db_path)
+    with _store_locks_guard:
+        if path in _store_locks:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle = open(path, "a+")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            raise MemoryBusyError(
+                f"The memory store at {db_path} is open in another Turing process (e.g. the Sidebar). "
+                "Close it and try again."
+            )
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{os.getpid()}\n")
+        handle.flush()
+        _store_locks[path] = handle
+
+def store_in_use(db_path: str) -> bool:
+    """True if another process currently has the store open (this process never counts)."""
+    if fcntl is None:
+        return False
+    path = _lock_path(db_path)
+    with _store_locks_guard:
+        if path in _store_locks or not os.path.exists(path):
+            return False
+        with open(path, "a+") as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return True
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            return False
+
 class TuringMemory:
-    def __init__(self):
+    def __init__(self, background: bool = False, db_path: str = None, warm_sessions=(), embedder=None):
         """
         Initializes the local Vector Database.
         It stores data directly on your SSD so the AI retains memory across reboots.
+
+        Only one process may have a store open; a second one fails with MemoryBusyError.
+
+        With background=True the (slow) Chroma client, collection and embedding model
+        are opened on a worker thread and `self.ready` resolves when they are usable.
+        Every method waits for it, so callers only block if they use memory too early.
+
+        Embeddings come from the shared, cached EmbeddingService (memory.embedding in
+        config.json); if it cannot start, Chroma's built-in embedding function is used.
         """
         # Define the path where the memory database will live
-        self.db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chroma_data")
+        self.db_path = db_path or resolve_db_path()
         os.makedirs(self.db_path, exist_ok=True)
 
-        # Initialize the persistent client
-        self.client = chromadb.PersistentClient(path=self.db_path)
-        
-        # Get or create a collection (table) for our sidebar chat history
-        self.collection = self.client.get_or_create_collection(
-            name="turing_sidebar_memory",
-            metadata={"hnsw:space": "cosine"} # Mathematical method for finding similar memories
+        # Per-session message counters used to page chat history in order
+        self._seq_lock = threading.RLock()
+        self._next_seq = {}
+        self.boot_seq = {} # next_seq of the warmed sessions at the moment memory came online
+
+        self.client = None
+        self.collection = None
+        self.open_seconds = None
+        self.ready = Future()
+        self._warm_sessions = tuple(warm_sessions)
+        self.embedder = embedder
+
+        if background:
+            threading.Thread(target=self._open, name="turing-memory-boot", daemon=True).start()
+        else:
+            self._open()
+            self.ready.result() # Surface boot errors synchronously, like before
+
+    def _open(self):
+        started = time.perf_counter()
+        try:
+            acquire_store_lock(self.db_path)
+
+            # Initialize the persistent client
+            self.client = chromadb.PersistentClient(path=self.db_path)
+
+            # Get or create a collection (table) for our sidebar chat history
+            self.collection = self.client.get_or_create_collection(
+                name="turing_sidebar_memory",
+                metadata={"hnsw:space": "cosine"} # Mathematical method for finding similar memories
+            )
+
+            # Pay the embedding model load now rather than on the first message
+            self._start_embedder()
+            if self.embedder is None and self.collection.count() > 0:
+                self.collection.query(query_texts=["warmup"], n_results=1)
+
+            if not os.path.exists(os.path.join(self.db_path, SEQ_BACKFILL_MARKER)):
+                self.backfill_seq()
+
+            for session_id in self._warm_sessions:
+                self.boot_seq[session_id] = self._load_next_seq(session_id)
+
+            self.open_seconds = time.perf_counter() - started
+            self.ready.set_result(self)
+        except Exception as e:
+            self.open_seconds = time.perf_counter() - started
+            self.ready.set_exception(e)
+
+    def _start_embedder(self):
+        settings = load_memory_config().get("embedding", {})
+        if self.embedder is None and not settings.get("enabled", True):
+            return
+        try:
+            if self.embedder is None:
+                from memory.embedding_service import get_embedding_service
+                self.embedder = get_embedding_service(settings)
+            self.embedder.warmup()
+        except Exception as e:
+            print(f"[Memory] Embedding service unavailable, using Chroma's default embedder: {e}")
+            self.embedder = None
+
+    def embed(self, texts: list):
+        """Vectors from the shared embedding service, or None to let Chroma embed the texts itself."""
+        if self.embedder is None:
+            return None
+        return self.embedder.embed(texts)
+
+    def is_ready(self) -> bool:
+        return self.ready.done() and self.ready.exception() is None
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Blocks until memory is online. Returns False on timeout or boot failure."""
+        try:
+            self.ready.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def backfill_seq(self, page_size: int = 1000) -> int:
+        """
+        Numbers chat turns that were saved without a seq (older stores), so history paging
+        and maintenance see them. Per session they are ordered by timestamp and placed before
+        the already numbered turns, which shift up by the same amount. Returns the rows numbered.
+        """
+        sessions = {}
+        offset = 0
+        while True:
+            page = self.collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            if not page["ids"]:
+                break
+            for memory_id, meta in zip(page["ids"], page["metadatas"]):
+                sessions.setdefault(meta.get("session_id"), []).append((memory_id, meta))
+            offset += len(page["ids"])
+
+        numbered = 0
+        for session_id, rows in sessions.items():
+            legacy = [r for r in rows if r[1].get("role") in CHAT_ROLES and "seq" not in r[1]]
+            if session_id is None or not legacy:
+                continue
+            # ISO timestamps sort chronologically; a user turn precedes the reply saved with it
+            legacy.sort(key=lambda r: (r[1].get("timestamp", ""), r[1].get("role") != "user"))
+            shift = len(legacy)
+
+            ids, metadatas = [], []
+            for seq, (memory_id, meta) in enumerate(legacy):
+                ids.append(memory_id)
+                metadatas.append({**meta, "seq": seq})
+            for memory_id, meta in rows:
+                if "seq" in meta:
+                    ids.append(memory_id)
+                    metadatas.append({**meta, "seq": meta["seq"] + shift})
+                elif "first_seq" in meta:
+                    # Digests keep pointing at the turns they summarised
+                    ids.append(memory_id)
+                    metadatas.append({**meta, "first_seq": meta["first_seq"] + shift,
+                                      "last_seq": meta["last_seq"] + shift})
+            for i in range(0, len(ids), page_size):
+                self.collection.update(ids=ids[i:i + page_size], metadatas=metadatas[i:i + page_size])
+            numbered += shift
+
+        with self._seq_lock:
+            self._next_seq.clear()
+        with open(os.path.join(self.db_path, SEQ_BACKFILL_MARKER), "w") as f:
+            f.write(f"{numbered}\n")
+        return numbered
+
+    def _session_where(self, session_id: str, start_seq: int, end_seq: int) -> dict:
+        return {"$and": [
+            {"session_id": session_id},
+            {"seq": {"$gte": start_seq}},
+            {"seq": {"$lt": end_seq}},
+        ]}
+
+    def next_seq(self, session_id: str) -> int:
+        """
+        Returns the sequence number the next message of this session will get.
+        The counter is recovered from disk once per session, then kept in RAM.
+        """
+        self.ready.result()
+        with self._seq_lock:
+            return self._load_next_seq(session_id)
+
+    def _load_next_seq(self, session_id: str) -> int:
+        with self._seq_lock:
+            if session_id not in self._next_seq:
+                existing = self.collection.get(
+                    where={"$and": [{"session_id": session_id}, {"seq": {"$gte": 0}}]},
+                    include=["metadatas"]
+                )
+                seqs = [meta["seq"] for meta in existing["metadatas"]]
+                self._next_seq[session_id] = max(seqs) + 1 if seqs else 0
+            return self._next_seq[session_id]
+
+    def reserve_seq(self, session_id: str) -> int:
+        """Claims a sequence number so the UI can place a message before it is saved."""
+        self.ready.result()
+        with self._seq_lock:
+            seq = self._load_next_seq(session_id)
+            self._next_seq[session_id] = seq + 1
+        return seq
+
+    def load_history(self, session_id: str, start_seq: int, end_seq: int) -> list:
+        """
+        Loads the messages with start_seq <= seq < end_seq, oldest first.
+        Returns a list of (seq, role, text) tuples. Gaps (empty or evicted turns) are skipped.
+        """
+        self.ready.result()
+        if end_seq <= start_seq or self.collection.count() == 0:
+            return []
+
+        results = self.collection.get(
+            where=self._session_where(session_id, start_seq, end_seq),
+            include=["documents", "metadatas"]
         )
+        rows = [
+            (meta["seq"], meta["role"], doc)
+            for doc, meta in zip(results["documents"], results["metadatas"])
+        ]
+        rows.sort(key=lambda row: row[0])
+        return rows
 
-    def save_memory(self, session_id: str, role: str, text: str):
+    def save_memory(self, session_id: str, role: str, text: str, seq: int = None):
         """
         Saves a single message (either from User or Turing) into the vector DB.
         """
         if not text.strip():
             return
 
+        self.ready.result()
+        if seq is None:
+            seq = self.reserve_seq(session_id)
+
         # Generate a unique ID for this specific memory
         timestamp = datetime.datetime.now().isoformat()
         memory_id = f"{session_id}_{timestamp}"
@@ -36,22 +307,72 @@ class TuringMemory:
         # Insert into the database
         self.collection.add(
             documents=[text],
-            metadatas=[{"role": role, "session_id": session_id, "timestamp": timestamp}],
+            embeddings=self.embed([text]),
+            metadatas=[{"role": role, "session_id": session_id, "timestamp": timestamp, "seq": seq}],
             ids=[memory_id]
         )
 
-    def retrieve_context(self, session_id: str, query: str, limit: int = 5) -> str:
+    def export_to(self, path: str, batch_size: int = 512) -> dict:
+        """Streams the whole store into one compact .tmem file (see memory_io.py)."""
+        from memory.memory_io import export_collection
+        self.ready.result()
+        return export_collection(self.collection, path, batch_size)
+
+    def import_from(self, path: str) -> dict:
+        """
+        Loads a .tmem export, reusing its embeddings instead of recomputing them.
+        Imported turns of a session that already has history here are numbered after it,
+        so the two histories never share seqs; records already in this store keep theirs.
+        """
+        from memory.memory_io import import_collection
+        self.ready.result()
+        offsets = {}
+
+        def renumber(ids, metadatas):
+            local = self.collection.get(ids=ids, include=["metadatas"])
+            existing = dict(zip(local["ids"], local["metadatas"]))
+            renumbered = []
+            for memory_id, meta in zip(ids, metadatas):
+                session_id = meta.get("session_id")
+                if memory_id in existing:
+                    # Same record (e.g. restoring a backup): keep its place in the local history
+                    kept = {k: existing[memory_id][k] for k in ("seq", "first_seq", "last_seq") if k in existing[memory_id]}
+                    renumbered.append({**meta, **kept})
+                    continue
+                if session_id not in offsets:
+                    # Read before any of this session's records are written, so only local turns count
+                    offsets[session_id] = self._load_next_seq(session_id) if session_id is not None else 0
+                shift = offsets[session_id]
+                if shift and "seq" in meta:
+                    meta = {**meta, "seq": meta["seq"] + shift}
+                elif shift and "first_seq" in meta:
+                    meta = {**meta, "first_seq": meta["first_seq"] + shift, "last_seq": meta["last_seq"] + shift}
+                renumbered.append(meta)
+            return renumbered
+
+        stats = import_collection(self.collection, path, transform=renumber)
+        # Exports of older stores may carry turns without a seq; this also resets cached counters
+        self.backfill_seq()
+        return stats
+
+    def retrieve_context(self, session_id: str, query: str, limit: int = 5, timeout: float = None) -> str:
         """
         Searches the database for past messages related to the current query.
         Returns a formatted string to inject into the AI's prompt.
+        If memory is still booting after `timeout` seconds, returns no context.
         """
+        if not self.wait_ready(timeout):
+            return ""
+
         # Check if the database is empty to prevent query errors
         if self.collection.count() == 0:
             return ""
 
         # Search the vector database for relevant past context
+        query_embeddings = self.embed([query])
         results = self.collection.query(
-            query_texts=[query],
+            query_texts=None if query_embeddings is not None else [query],
+            query_embeddings=query_embeddings,
             n_results=limit,
             where={"session_id": session_id} # Only get memories from this specific chat session
         )
@@ -0,0 +1,283 @@
+import os
+import sys
+import time
+import queue
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from concurrent.futures import Future
+
+# Add the parent directory to the system path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.cache import CACHE_DIR
+
+# Defaults for the "embedding" block of the memory config.
+# all-MiniLM-L6-v2 is the model behind Chroma's default embedding function,
+# so vectors stay compatible with stores created before this service existed.
+DEFAULT_EMBEDDING = {
+    "model": "all-MiniLM-L6-v2",
+    "threads": 2,             # CPU threads for inference
+    "batch_window_ms": 8,     # how long to wait for other callers to join a batch
+    "max_batch": 64,
+    "cache": True,
+    "cache_max_entries": 20000,  # least recently used vectors beyond this are dropped
+    "cache_max_age_days": 30,    # ... as are vectors unused for this long (maintenance pass)
+}
+
+# Size is enforced inline every this many inserts; the age bound is applied by maintenance
+TRIM_EVERY = 500
+
+
+class EmbeddingCache:
+    def __init__(self, path: str = None, max_entries: int = None):
+        """
+        Persistent text -> vector cache (SQLite, float32 blobs keyed by model + text hash).
+        Bounded: rows carry a last-used time, and the least recently used ones are evicted.
+        """
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "embeddings.sqlite3")
+        self.max_entries = max_entries or DEFAULT_EMBEDDING["cache_max_entries"]
+        self._inserts = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS vectors (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(vectors)")}
+        if "last_used" not in columns:
+            # Caches created before the bound existed: treat every row as used now
+            self._conn.execute(f"ALTER TABLE vectors ADD COLUMN last_used INTEGER NOT NULL DEFAULT {int(time.time())}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS vectors_last_used ON vectors (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        return hashlib.blake2b(f"{model}\x00{text}".encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, keys: list) -> dict:
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                for key, blob in self._conn.execute(
+                    f"SELECT key, vector FROM vectors WHERE key IN ({placeholders})", batch
+                ):
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+            if found:
+                now = int(time.time())
+                hits = list(found)
+                for i in range(0, len(hits), 500):
+                    batch = hits[i:i + 500]
+                    self._conn.execute(
+                        f"UPDATE vectors SET last_used = ? WHERE key IN ({','.join('?' * len(batch))})", [now] + batch
+                    )
+                self._conn.commit()
+        return found
+
+    def set_many(self, items: dict):
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in items.items()]
+            )
+            self._conn.commit()
+            self._inserts += len(items)
+            if self._inserts >= TRIM_EVERY:
+                self._inserts = 0
+                self._trim(self.max_entries)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    def _trim(self, max_entries: int) -> int:
+        """Evicts the least recently used rows beyond max_entries (caller holds the lock)."""
+        cursor = self._conn.execute(
+            "DELETE FROM vectors WHERE key IN "
+            "(SELECT key FROM vectors ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (max_entries,)
+        )
+        self._conn.commit()
+        return cursor.rowcount
+
+    def prune(self, max_age_days: float = None, max_entries: int = None, vacuum: bool = True) -> int:
+        """
+        Drops vectors unused for max_age_days and the least recently used beyond max_entries,
+        then gives the space back to the disk. Returns the number of rows removed.
+        """
+        max_age_days = max_age_days if max_age_days is not None else DEFAULT_EMBEDDING["cache_max_age_days"]
+        with self._lock:
+            cutoff = int(time.time() - max_age_days * 86400)
+            removed = self._conn.execute("DELETE FROM vectors WHERE last_used < ?", (cutoff,)).rowcount
+            self._conn.commit()
+            removed += self._trim(max_entries or self.max_entries)
+            if removed and vacuum:
+                self._conn.execute("VACUUM")
+                # In WAL mode the shrunken pages reach the main file only at a checkpoint
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingService:
+    def __init__(self, model: str = None, threads: int = None, batch_window_ms: float = None,
+                 max_batch: int = None, cache: bool = None, cache_max_entries: int = None):
+        """
+        Shared embedding front-end for every memory operation.
+        Concurrent callers are coalesced into one batch (collected for batch_window_ms),
+        served from the persistent cache where possible, and the rest is encoded
+        on a single dedicated inference thread.
+        """
+        self.model_name = model or DEFAULT_EMBEDDING["model"]
+        self.threads = threads or DEFAULT_EMBEDDING["threads"]
+        self.batch_window = (batch_window_ms if batch_window_ms is not None else DEFAULT_EMBEDDING["batch_window_ms"]) / 1000.0
+        self.max_batch = max_batch or DEFAULT_EMBEDDING["max_batch"]
+        use_cache = cache if cache is not None else DEFAULT_EMBEDDING["cache"]
+        self.cache = EmbeddingCache(max_entries=cache_max_entries) if use_cache else None
+
+        self.stats = {"requests": 0, "texts": 0, "cache_hits": 0, "encoded": 0, "batches": 0}
+        self._model = None
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="turing-embedder", daemon=True)
+        self._thread.start()
+
+    # ---- Public API ----
+    def embed(self, texts: list) -> list:
+        """Returns one float32 vector per text (blocks until the batch containing them is done)."""
+        if not texts:
+            return []
+        future = Future()
+        self._requests.put((list(texts), future))
+        return future.result()
+
+    def warmup(self):
+        """Loads the model (and pays its first-call cost) ahead of real traffic."""
+        self.embed(["warmup"])
+
+    # ---- Inference thread ----
+    def _load_model(self):
+        import torch
+        from sentence_transformers import SentenceTransformer
+        torch.set_num_threads(self.threads)
+        return SentenceTransformer(self.model_name, device="cpu")
+
+    def _collect(self) -> list:
+        """Blocks for one request, then gathers whatever else arrives within the batch window."""
+        batch = [self._requests.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.batch_window
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request[0])
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            self.stats["requests"] += len(batch)
+            try:
+                if self._model is None:
+                    self._model = self._load_model()
+                vectors = self._encode_unique({text for texts, _ in batch for text in texts})
+                for texts, future in batch:
+                    future.set_result([vectors[text] for text in texts])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _encode_unique(self, unique_texts: set) -> dict:
+        texts = list(unique_texts)
+        vectors = {}
+
+        keys = {}
+        if self.cache is not None:
+            keys = {text: EmbeddingCache.key(self.model_name, text) for text in texts}
+            cached = self.cache.get_many(list(keys.values()))
+            for text in texts:
+                vector = cached.get(keys[text])
+                if vector is not None:
+                    vectors[text] = vector
+
+        missing = [text for text in texts if text not in vectors]
+        if missing:
+            encoded = self._model.encode(
+                missing, batch_size=self.max_batch, normalize_embeddings=True, convert_to_numpy=True
+            ).astype(np.float32)
+            fresh = dict(zip(missing, encoded))
+            vectors.update(fresh)
+            if self.cache is not None:
+                self.cache.set_many({keys[text]: vector for text, vector in fresh.items()})
+
+        self.stats["batches"] += 1
+        self.stats["texts"] += len(texts)
+        self.stats["cache_hits"] += len(texts) - len(missing)
+        self.stats["encoded"] += len(missing)
+        return vectors
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_embedding_service(settings: dict = None) -> EmbeddingService:
+    """One service per process, so every TuringMemory/maintenance job shares the batcher and cache."""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            options = dict(DEFAULT_EMBEDDING)
+            options.update(settings or {})
+            _shared_service = EmbeddingService(
+                options["model"], options["threads"], options["batch_window_ms"], options["max_batch"],
+                options["cache"], options["cache_max_entries"]
+            )
+        return _shared_service
+
+
+def prune_embedding_cache(settings: dict = None, cache: EmbeddingCache = None) -> int:
+    """
+    Applies the age/size bounds to the on-disk embedding cache (run by memory maintenance).
+    Uses the live service's cache when given, otherwise opens the cache file if it exists.
+    """
+    options = dict(DEFAULT_EMBEDDING)
+    options.update(settings or {})
+    if cache is not None:
+        return cache.prune(options["cache_max_age_days"], options["cache_max_entries"])
+
+    path = os.path.join(CACHE_DIR, "embeddings.sqlite3")
+    if not os.path.exists(path):
+        return 0
+    cache = EmbeddingCache(path, options["cache_max_entries"])
+    try:
+        return cache.prune(options["cache_max_age_days"])
+    finally:
+        cache.close()
+
+
+# Test the module
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    service = get_embedding_service()
+    print(f"Loading {service.model_name}...")
+    service.warmup()
+
+    phrases = ["ok", "thanks", "What is my name?", "ok", "How do I free disk space?"] * 20
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda text: service.embed([text]), phrases))
+    print(f"{len(phrases)} concurrent requests in {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(service.stats)
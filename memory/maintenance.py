@@ -0,0 +1,293 @@
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import uuid
+import hashlib
+import argparse
+import datetime
+import threading
+import subprocess
+
+# Add the parent directory to the system path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from memory.chroma_db_manager import TuringMemory, MemoryBusyError, load_memory_config
+
+# Defaults for the "retention" block of the memory config
+DEFAULT_RETENTION = {
+    "max_age_days": 30,           # raw turns older than this are digested and evicted
+    "max_turns_per_session": 400, # ... as are turns beyond this count (oldest first)
+    "keep_recent_turns": 60,      # the newest turns of a session are never touched
+    "digest_batch": 40,           # turns folded into one digest memory
+    "interval_hours": 24,         # how often the sidebar schedules a run
+}
+
+RAW_ROLES = ("user", "turing")
+PAGE_SIZE = 1000
+
+
+def set_idle_priority(whole_process: bool = False):
+    """
+    Drops the calling thread (or whole process) to the lowest CPU and I/O priority.
+    On Linux, nice values are per-thread, so the sidebar's UI thread is unaffected.
+    """
+    target = 0 if whole_process else threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, target, 19)
+        if whole_process and hasattr(os, "SCHED_IDLE"):
+            os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    except (OSError, AttributeError):
+        pass
+
+    if shutil.which("ionice"):
+        subprocess.run(["ionice", "-c", "3", "-p", str(os.getpid() if whole_process else target)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class MemoryMaintenance:
+    def __init__(self, memory: TuringMemory, engine=None, retention: dict = None, summarize: bool = True):
+        """
+        Keeps the sidebar memory bounded:
+        1. Deduplicates identical old turns within a session
+        2. Folds old turns into compact "digest" memories (via the LLM)
+        3. Evicts the raw turns by age / per-session count
+        4. Compacts the underlying SQLite store
+        5. Prunes the embedding cache to its age / size bounds
+        """
+        self.memory = memory
+        self.engine = engine
+        self.summarize = summarize and engine is not None
+        self.retention = dict(DEFAULT_RETENTION)
+        self.retention.update(retention if retention is not None else load_memory_config().get("retention", {}))
+
+    def _scan(self):
+        """
+        Pages through the collection (documents never held all at once) and returns
+        ({session_id: [(seq, id, timestamp, role, text_hash)]} for raw chat turns,
+        number of chat turns that have no seq yet).
+        """
+        sessions = {}
+        unnumbered = 0
+        offset = 0
+        while True:
+            page = self.memory.collection.get(
+                include=["documents", "metadatas"], limit=PAGE_SIZE, offset=offset
+            )
+            if not page["ids"]:
+                break
+            for memory_id, doc, meta in zip(page["ids"], page["documents"], page["metadatas"]):
+                if meta.get("role") not in RAW_ROLES:
+                    continue
+                if "seq" not in meta:
+                    unnumbered += 1
+                    continue
+                digest = hashlib.blake2b(f"{meta['role']}:{doc}".encode(), digest_size=8).digest()
+                sessions.setdefault(meta["session_id"], []).append(
+                    (meta["seq"], memory_id, meta.get("timestamp", ""), meta["role"], digest)
+                )
+            offset += len(page["ids"])
+
+        for turns in sessions.values():
+            turns.sort()
+        return sessions, unnumbered
+
+    def _select(self, turns: list, now: datetime.datetime):
+        """Splits a session into (duplicate ids, turns to digest + evict)."""
+        protected = max(0, len(turns) - self.retention["keep_recent_turns"])
+        candidates = turns[:protected]
+
+        # Exact duplicates among the old turns (newest copy wins)
+        seen, duplicates, unique = set(), [], []
+        for turn in reversed(candidates):
+            if turn[4] in seen:
+                duplicates.append(turn[1])
+            else:
+                seen.add(turn[4])
+                unique.append(turn)
+        unique.reverse()
+
+        cutoff = now - datetime.timedelta(days=self.retention["max_age_days"])
+        overflow = max(0, len(turns) - len(duplicates) - self.retention["max_turns_per_session"])
+
+        evict = []
+        for index, turn in enumerate(unique):
+            try:
+                too_old = datetime.datetime.fromisoformat(turn[2]) < cutoff
+            except ValueError:
+                too_old = False
+            if too_old or index < overflow:
+                evict.append(turn)
+        return duplicates, evict
+
+    def _digest(self, session_id: str, batch: list) -> bool:
+        """Summarizes a batch of turns into one digest memory. Returns False if it was not stored."""
+        ids = [turn[1] for turn in batch]
+        records = self.memory.collection.get(ids=ids, include=["documents", "metadatas"])
+        by_id = {i: (doc, meta) for i, doc, meta in zip(records["ids"], records["documents"], records["metadatas"])}
+        transcript = "\n".join(
+            f"{by_id[i][1]['role'].upper()}: {by_id[i][0][:500]}" for i in ids if i in by_id
+        )
+
+        summary = self.engine.generate_response(
+            "Condense this old conversation into a short factual digest (max 8 bullet points). "
+            "Keep names, preferences, decisions and facts about the user; drop small talk.\n\n"
+            f"{transcript}",
+            profile="summary"
+        ).strip()
+        if not summary or summary.startswith("[System Error]"):
+            return False
+
+        first, last = batch[0], batch[-1]
+        timestamp = datetime.datetime.now().isoformat()
+        # Seq ranges repeat (backfill shifts them, imports bring their own digests), so the id must not
+        # depend on them: Chroma silently ignores an add whose id exists, and the turns would be lost
+        digest_id = f"{session_id}_digest_{uuid.uuid4().hex}"
+        self.memory.collection.add(
+            documents=[summary],
+            embeddings=self.memory.embed([summary]),
+            metadatas=[{
+                "role": "digest", "session_id": session_id, "timestamp": timestamp,
+                "first_seq": first[0], "last_seq": last[0], "period_start": first[2], "period_end": last[2],
+                "turns": len(batch),
+            }],
+            ids=[digest_id]
+        )
+        # Only evict the raw turns once their digest is really in the store
+        return self.memory.collection.get(ids=[digest_id], include=[])["ids"] == [digest_id]
+
+    def _delete(self, ids: list):
+        for i in range(0, len(ids), PAGE_SIZE):
+            self.memory.collection.delete(ids=ids[i:i + PAGE_SIZE])
+
+    def compact(self) -> bool:
+        """
+        VACUUMs Chroma's SQLite file so deleted rows give their space back to the SSD.
+        Safe only because this process holds the store lock (see TuringMemory): no other
+        process has Chroma open on it, and Chroma's row ids are INTEGER PRIMARY KEYs that VACUUM keeps.
+        """
+        sqlite_path = os.path.join(self.memory.db_path, "chroma.sqlite3")
+        if not os.path.exists(sqlite_path):
+            return False
+        try:
+            conn = sqlite3.connect(sqlite_path, timeout=30)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("VACUUM")
+            conn.close()
+            return True
+        except sqlite3.OperationalError:
+            # Store busy (e.g. a write in flight): try again on the next run
+            return False
+
+    def prune_embeddings(self) -> int:
+        """Applies the age/size bounds of memory.embedding to the persistent embedding cache."""
+        from memory.embedding_service import prune_embedding_cache
+        embedder = self.memory.embedder
+        cache = getattr(embedder, "cache", None) if embedder is not None else None
+        try:
+            return prune_embedding_cache(load_memory_config().get("embedding", {}), cache)
+        except sqlite3.OperationalError:
+            # Cache busy: try again on the next run
+            return 0
+
+    def run(self) -> dict:
+        self.memory.wait_ready()
+        started = time.perf_counter()
+        report = {"sessions": 0, "duplicates": 0, "digested": 0, "evicted": 0, "digests": 0,
+                  "compacted": False, "bytes_before": directory_size(self.memory.db_path)}
+
+        sessions, unnumbered = self._scan()
+        if unnumbered:
+            # Turns from before per-session seqs (e.g. imported later): number them, then rescan
+            report["backfilled"] = self.memory.backfill_seq()
+            sessions, _ = self._scan()
+
+        now = datetime.datetime.now()
+        for session_id, turns in sessions.items():
+            report["sessions"] += 1
+            duplicates, evict = self._select(turns, now)
+
+            if duplicates:
+                self._delete(duplicates)
+                report["duplicates"] += len(duplicates)
+
+            size = self.retention["digest_batch"]
+            for i in range(0, len(evict), size):
+                batch = evict[i:i + size]
+                if self.summarize:
+                    if not self._digest(session_id, batch):
+                        # Never drop raw turns we could not condense
+                        continue
+                    report["digests"] += 1
+                    report["digested"] += len(batch)
+                self._delete([turn[1] for turn in batch])
+                report["evicted"] += len(batch)
+
+        if report["duplicates"] or report["evicted"]:
+            report["compacted"] = self.compact()
+        report["embeddings_pruned"] = self.prune_embeddings()
+
+        report["bytes_after"] = directory_size(self.memory.db_path)
+        report["seconds"] = round(time.perf_counter() - started, 2)
+        return report
+
+
+def start_background_maintenance(memory: TuringMemory, engine, on_done=None) -> threading.Thread:
+    """Runs one maintenance pass on an idle-priority daemon thread (used by the sidebar)."""
+    def work():
+        set_idle_priority()
+        try:
+            report = MemoryMaintenance(memory, engine).run()
+        except Exception as e:
+            report = {"error": str(e)}
+        if on_done:
+            on_done(report)
+
+    thread = threading.Thread(target=work, name="turing-memory-maintenance", daemon=True)
+    thread.start()
+    return thread
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Digest, evict and compact Turing's vector memory.")
+    parser.add_argument("--no-summary", action="store_true", help="Evict old turns without writing digests (no LLM needed)")
+    parser.add_argument("--max-age-days", type=int, help="Override retention.max_age_days")
+    parser.add_argument("--max-turns", type=int, help="Override retention.max_turns_per_session")
+    args = parser.parse_args()
+
+    set_idle_priority(whole_process=True)
+
+    retention = load_memory_config().get("retention", {})
+    if args.max_age_days is not None:
+        retention["max_age_days"] = args.max_age_days
+    if args.max_turns is not None:
+        retention["max_turns_per_session"] = args.max_turns
+
+    engine = None
+    if not args.no_summary:
+        from core.llm_engine import TuringLLMEngine
+        engine = TuringLLMEngine()
+
+    print("Running Turing memory maintenance at idle priority...")
+    try:
+        memory = TuringMemory()
+    except MemoryBusyError as e:
+        print(f"[System Error] {e} (the Sidebar runs maintenance itself once a day)")
+        sys.exit(1)
+    result = MemoryMaintenance(memory, engine, retention, summarize=not args.no_summary).run()
+    for key, value in result.items():
+        print(f"  {key:14} {value}")
@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+import numpy as np
+
+# Add the parent directory to the system path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# File layout (.tmem):
+#   MAGIC
+#   <u32 header_len> <header json>
+#   repeated blocks: <u32 compressed_len> <u32 raw_len> <u32 crc32(raw)> <zlib(raw)>
+#       raw = <u32 columns_len> <columns json: ids, documents, metadatas> <float16 embeddings, n x dim>
+#   <u32 0> end marker, then <u32 footer_len> <footer json: count>
+MAGIC = b"TURINGMEM\x01"
+FORMAT_VERSION = 1
+BLOCK = struct.Struct("<III")
+U32 = struct.Struct("<I")
+
+
+class MemoryFormatError(Exception):
+    pass
+
+
+def _write_json(f, payload: dict):
+    data = json.dumps(payload).encode("utf-8")
+    f.write(U32.pack(len(data)))
+    f.write(data)
+
+
+def _read_exact(f, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise MemoryFormatError("Unexpected end of file (truncated export?)")
+    return data
+
+
+def _read_json(f) -> dict:
+    (size,) = U32.unpack(_read_exact(f, U32.size))
+    return json.loads(_read_exact(f, size))
+
+
+def export_collection(collection, path: str, batch_size: int = 512) -> dict:
+    """
+    Streams a Chroma collection to a single compact file.
+    Only one batch is ever held in RAM; embeddings are stored as float16.
+    """
+    total = collection.count()
+    started = time.perf_counter()
+    count, dim = 0, None
+
+    tmp_path = path + ".part"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        _write_json(f, {
+            "version": FORMAT_VERSION,
+            "collection": collection.name,
+            "metadata": collection.metadata,
+            "records": total,
+            "created": time.time(),
+        })
+
+        for offset in range(0, total, batch_size):
+            page = collection.get(
+                include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=offset
+            )
+            if not page["ids"]:
+                break
+
+            embeddings = np.asarray(page["embeddings"], dtype=np.float16)
+            if dim is None:
+                dim = embeddings.shape[1]
+            columns = json.dumps({
+                "ids": page["ids"], "documents": page["documents"], "metadatas": page["metadatas"], "dim": dim
+            }).encode("utf-8")
+            raw = U32.pack(len(columns)) + columns + embeddings.tobytes()
+            compressed = zlib.compress(raw, 6)
+
+            f.write(BLOCK.pack(len(compressed), len(raw), zlib.crc32(raw)))
+            f.write(compressed)
+            count += len(page["ids"])
+
+        f.write(U32.pack(0))
+        _write_json(f, {"count": count, "dim": dim})
+
+    os.replace(tmp_path, path)
+    return {"records": count, "bytes": os.path.getsize(path), "seconds": time.perf_counter() - started}
+
+
+def iter_blocks(path: str):
+    """Yields (ids, documents, metadatas, float32 embeddings) per block, validating as it goes."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise MemoryFormatError("Not a Turing memory export")
+        header = _read_json(f)
+        if header.get("version") != FORMAT_VERSION:
+            raise MemoryFormatError(f"Unsupported export version {header.get('version')}")
+
+        seen = 0
+        while True:
+            (compressed_len,) = U32.unpack(_read_exact(f, U32.size))
+            if compressed_len == 0:
+                break
+            raw_len, crc = struct.unpack("<II", _read_exact(f, 8))
+            try:
+                raw = zlib.decompress(_read_exact(f, compressed_len))
+            except zlib.error:
+                raise MemoryFormatError(f"Corrupted block after {seen} records (bad compression)")
+            if len(raw) != raw_len or zlib.crc32(raw) != crc:
+                raise MemoryFormatError(f"Corrupted block after {seen} records (checksum mismatch)")
+
+            (columns_len,) = U32.unpack(raw[:U32.size])
+            columns = json.loads(raw[U32.size:U32.size + columns_len])
+            ids, dim = columns["ids"], columns["dim"]
+            embeddings = np.frombuffer(raw, dtype=np.float16, offset=U32.size + columns_len)
+            if embeddings.size != len(ids) * dim:
+                raise MemoryFormatError(f"Embedding block has the wrong shape after {seen} records")
+            embeddings = embeddings.reshape(len(ids), dim).astype(np.float32)
+            if not np.isfinite(embeddings).all():
+                raise MemoryFormatError(f"Non-finite embedding values after {seen} records")
+            if len(columns["documents"]) != len(ids) or len(columns["metadatas"]) != len(ids):
+                raise MemoryFormatError(f"Column length mismatch after {seen} records")
+
+            seen += len(ids)
+            yield ids, columns["documents"], columns["metadatas"], embeddings
+
+        footer = _read_json(f)
+        if footer.get("count") != seen:
+            raise MemoryFormatError(f"Export declares {footer.get('count')} records but contains {seen}")
+
+
+def import_collection(collection, path: str, validate: bool = True, transform=None) -> dict:
+    """
+    Batch-upserts an export into a collection using the stored embeddings
+    (nothing is re-embedded). Existing ids are overwritten.
+    With validate=True the whole file is checked first, so a corrupt export
+    never leaves the store half-imported.
+    transform(ids, metadatas) -> metadatas, if given, rewrites each block before it is written.
+    """
+    started = time.perf_counter()
+    count = 0
+    if validate:
+        for _ in iter_blocks(path):
+            pass
+
+    existing_dim = None
+    if collection.count() > 0:
+        sample = collection.get(include=["embeddings"], limit=1)
+        existing_dim = len(sample["embeddings"][0])
+
+    for ids, documents, metadatas, embeddings in iter_blocks(path):
+        if existing_dim is not None and embeddings.shape[1] != existing_dim:
+            raise MemoryFormatError(
+                f"Export uses {embeddings.shape[1]}-dim embeddings but this store uses {existing_dim}"
+            )
+        if transform is not None:
+            metadatas = transform(ids, metadatas)
+        collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+        count += len(ids)
+
+    return {"records": count, "bytes": os.path.getsize(path), "seconds": time.perf_counter() - started}
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+if __name__ == "__main__":
+    from memory.chroma_db_manager import TuringMemory, MemoryBusyError
+
+    parser = argparse.ArgumentParser(description="Export or import Turing's vector memory as a single .tmem file.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("file", help="Path of the .tmem file")
+    parser.add_argument("--db", help="Vector store directory (defaults to memory.vector_db_path)")
+    parser.add_argument("--batch-size", type=int, default=512)
+    args = parser.parse_args()
+
+    try:
+        memory = TuringMemory(db_path=args.db)
+        if args.action == "export":
+            stats = memory.export_to(args.file, args.batch_size)
+        else:
+            stats = memory.import_from(args.file)
+    except (MemoryFormatError, MemoryBusyError, OSError) as e:
+        print(f"[System Error] {e}")
+        sys.exit(1)
+
+    rate = stats["records"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(f"{args.action.title()}ed {stats['records']} memories ({stats['bytes'] / 1e6:.2f} MB) "
+          f"in {stats['seconds']:.2f}s ({rate:.0f} records/s)")
@@ -0,0 +1,106 @@
+import threading
+import difflib
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+def normalise_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class SpeculativePrefetcher:
+    def __init__(self, memory, router=None, session_id="default_user_session", similarity=0.85):
+        """
+        Runs memory retrieval (and skill routing) for partially typed text in the
+        background, so the work is usually finished by the time Enter is pressed.
+        Only the most recent prefetch is kept; older ones are cancelled or discarded.
+        """
+        self.memory = memory
+        self.router = router
+        self.session_id = session_id
+        self.similarity = similarity
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="turing-prefetch")
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._future = None
+        self._future_query = ""
+        self._latest = None  # (normalised query, context, skill_match)
+
+        self.stats = {"scheduled": 0, "cancelled": 0, "stale": 0, "hits": 0, "misses": 0}
+
+    def schedule(self, partial_text: str):
+        """Starts a prefetch for the current input, superseding any older one."""
+        query = normalise_query(partial_text)
+        with self._lock:
+            if self._latest and self._latest[0] == query:
+                return
+            self._generation += 1
+            generation = self._generation
+            if self._future is not None and self._future.cancel():
+                self.stats["cancelled"] += 1
+            self.stats["scheduled"] += 1
+            self._future_query = query
+            self._future = self._executor.submit(self._run, generation, partial_text, query)
+
+    def _run(self, generation, text, query):
+        with self._lock:
+            if generation != self._generation:
+                self.stats["stale"] += 1
+                return None
+
+        # Never hold the prefetch thread hostage to a memory store that is still booting
+        if not self.memory.is_ready():
+            return None
+
+        context = self.memory.retrieve_context(self.session_id, text)
+        match = self.router.route(text) if self.router is not None else None
+
+        with self._lock:
+            # A newer keystroke already superseded this query: drop the result
+            if generation != self._generation:
+                self.stats["stale"] += 1
+                return None
+            self._latest = (query, context, match)
+        return self._latest
+
+    def _close_enough(self, a: str, b: str) -> bool:
+        if a == b:
+            return True
+        return difflib.SequenceMatcher(None, a, b).ratio() >= self.similarity
+
+    def take(self, final_text: str, wait: float = 0.5):
+        """
+        Returns (context, skill_match) prefetched for text close to final_text, or None.
+        An in-flight prefetch for a close query is awaited for up to `wait` seconds.
+        The skill match is only reused when the text is identical (arguments may differ).
+        """
+        query = normalise_query(final_text)
+        with self._lock:
+            latest = self._latest
+            future = self._future
+            in_flight = future is not None and not future.done() and self._close_enough(self._future_query, query)
+
+        if in_flight:
+            try:
+                latest = future.result(timeout=wait) or latest
+            except TimeoutError:
+                pass
+
+        with self._lock:
+            # The final query supersedes anything still queued or running
+            self._generation += 1
+            self._latest = None
+            if latest is None or not self._close_enough(latest[0], query):
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+
+        context, match = latest[1], latest[2]
+        return context, (match if latest[0] == query else None)
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,297 @@
+import os
+import re
+import sys
+import math
+import zlib
+
+# Add the parent directory to the system path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Size of the hashed feature space used for intent embeddings
+EMBEDDING_DIM = 512
+
+# Minimum cosine similarity before the classifier trusts its nearest neighbour
+CLASSIFIER_THRESHOLD = 0.5
+
+# Reserved intent name for ordinary conversation (never dispatched)
+CHAT_INTENT = "chat"
+
+# Pulls file/folder looking tokens out of free text: ~/x, /x/y, a/b, name.ext
+PATH_TOKEN = re.compile(r"(~?/[^\s'\"`]+|[\w.-]+/[\w./-]*|[\w-]+\.[A-Za-z0-9]{1,8})")
+QUOTED_TOKEN = re.compile(r"[\"'`]([^\"'`]+)[\"'`]")
+FOLDER_PHRASE = re.compile(r"\b(?:in|inside|of|under)\s+(?:my\s+|the\s+)?([\w.-]+)\s+(?:folder|directory|dir)\b", re.IGNORECASE)
+
+
+def embed_text(text: str) -> dict:
+    """
+    Cheap hashed bag-of-features embedding (word unigrams + char trigrams).
+    Returns a sparse, L2-normalised {bucket: weight} vector.
+    """
+    vector = {}
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    for word in words:
+        bucket = zlib.crc32(word.encode()) % EMBEDDING_DIM
+        vector[bucket] = vector.get(bucket, 0.0) + 1.0
+        padded = f"#{word}#"
+        for i in range(len(padded) - 2):
+            bucket = zlib.crc32(padded[i:i + 3].encode()) % EMBEDDING_DIM
+            vector[bucket] = vector.get(bucket, 0.0) + 0.5
+
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    if norm:
+        for bucket in vector:
+            vector[bucket] /= norm
+    return vector
+
+
+def cosine(a: dict, b: dict) -> float:
+    """Dot product of two normalised sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(bucket, 0.0) for bucket, w in a.items())
+
+
+def extract_path(text: str) -> str:
+    """Best-effort extraction of a path argument from free text."""
+    quoted = QUOTED_TOKEN.search(text)
+    if quoted:
+        return quoted.group(1).strip()
+    match = PATH_TOKEN.search(text)
+    if match:
+        return match.group(1).rstrip(".,;:?!")
+    folder = FOLDER_PHRASE.search(text)
+    if folder and folder.group(1).lower() not in ("home", "this", "current"):
+        return folder.group(1)
+    return ""
+
+
+class Skill:
+    def __init__(self, name, handler, patterns=None, examples=None, extract_args=None, direct=True, required=()):
+        """
+        A dispatchable action.
+        - handler: callable(**args) -> str
+        - patterns: regexes (named groups become args) that trigger a direct dispatch
+        - examples: phrases used to build the nearest-neighbour intent embeddings
+        - extract_args: callable(text) -> dict used when only the classifier matched
+        - direct: pattern hits answer the user without an LLM round-trip
+        - required: args that must be non-empty for a classifier match to count
+        """
+        self.name = name
+        self.handler = handler
+        self.patterns = patterns or []
+        self.examples = examples or []
+        self.extract_args = extract_args or (lambda text: {})
+        self.direct = direct
+        self.required = tuple(required)
+
+
+class SkillMatch:
+    def __init__(self, skill, args, confidence, via):
+        self.skill = skill
+        self.args = args
+        self.confidence = confidence
+        self.via = via  # "pattern" or "classifier"
+
+    @property
+    def direct(self) -> bool:
+        """Only exact pattern hits are trusted to skip the LLM entirely."""
+        return self.via == "pattern" and self.skill.direct
+
+    def execute(self) -> str:
+        try:
+            return self.skill.handler(**self.args)
+        except Exception as e:
+            return f"[System Error] Skill '{self.skill.name}' failed: {e}"
+
+
+class IntentRouter:
+    def __init__(self, threshold: float = CLASSIFIER_THRESHOLD):
+        """
+        Zero-LLM router: a single compiled pattern automaton for exact commands,
+        backed by a nearest-neighbour classifier over precomputed intent embeddings.
+        """
+        self.threshold = threshold
+        self.skills = {}
+        self._automaton = None
+        self._pattern_owners = []
+        self._neighbours = []  # (intent_name, embedding)
+
+    def register(self, skill: Skill):
+        self.skills[skill.name] = skill
+        self._automaton = None
+
+    def add_chat_examples(self, examples):
+        """Negative examples: ordinary chat that must NOT trigger a skill."""
+        for example in examples:
+            self._neighbours.append((CHAT_INTENT, embed_text(example)))
+
+    def compile(self):
+        """Fuses every skill pattern into one alternation and embeds all examples."""
+        alternatives = []
+        self._pattern_owners = []
+        self._neighbours = [n for n in self._neighbours if n[0] == CHAT_INTENT]
+
+        for skill in self.skills.values():
+            for pattern in skill.patterns:
+                index = len(self._pattern_owners)
+                # Prefix named groups so they stay unique inside the combined regex
+                scoped = re.sub(r"\(\?P<(\w+)>", rf"(?P<p{index}_\1>", pattern)
+                alternatives.append(f"(?P<p{index}>{scoped})")
+                self._pattern_owners.append(skill)
+            for example in skill.examples:
+                self._neighbours.append((skill.name, embed_text(example)))
+
+        combined = "|".join(alternatives) if alternatives else r"(?!x)x"
+        self._automaton = re.compile(rf"^\s*(?:{combined})\s*[.?!]*\s*$", re.IGNORECASE)
+
+    def route(self, text: str):
+        """Returns a SkillMatch, or None when the text is ordinary conversation."""
+        if self._automaton is None:
+            self.compile()
+
+        # 1. Exact command patterns (single regex pass)
+        hit = self._automaton.match(text)
+        if hit:
+            groups = hit.groupdict()
+            for index, skill in enumerate(self._pattern_owners):
+                if groups.get(f"p{index}") is None:
+                    continue
+                prefix = f"p{index}_"
+                args = {
+                    key[len(prefix):]: value.strip()
+                    for key, value in groups.items()
+                    if key.startswith(prefix) and value is not None
+                }
+                return SkillMatch(skill, args, 1.0, "pattern")
+
+        # 2. Nearest neighbour over the intent embeddings
+        query = embed_text(text)
+        best_intent, best_score = None, 0.0
+        for intent, vector in self._neighbours:
+            score = cosine(query, vector)
+            if score > best_score:
+                best_intent, best_score = intent, score
+
+        if best_intent is None or best_intent == CHAT_INTENT or best_score < self.threshold:
+            return None
+
+        skill = self.skills[best_intent]
+        args = skill.extract_args(text)
+        if any(not args.get(name) for name in skill.required):
+            # Sounds like the skill but names nothing to act on: leave it to the LLM
+            return None
+        return SkillMatch(skill, args, best_score, "classifier")
+
+
+def create_default_router(file_ops=None, engine=None) -> IntentRouter:
+    """Builds the sidebar router with the built-in file and shell skills."""
+    if file_ops is None:
+        from skills.file_ops import FileOperations
+        file_ops = FileOperations()
+
+    shell_agent = []
+
+    def translate(intent=""):
+        # The ShellAgent (and its engine) is only built on first use
+        if not shell_agent:
+            from skills.shell_ops import ShellAgent
+            shell_agent.append(ShellAgent(engine=engine))
+        command = shell_agent[0].translate_to_bash(intent)
+        return f"Proposed command (run it in Turing Shell):\n{command}"
+
+    def normalise(path=""):
+        path = path.strip().strip("\"'`")
+        return os.path.expanduser(path) if path.startswith("~") else path
+
+    router = IntentRouter()
+    # Registered first: "show the contents of config.json" is a file read, not a listing
+    router.register(Skill(
+        "read_file",
+        lambda path="": file_ops.read_file(normalise(path)),
+        patterns=[
+            r"(?:cat|read|open|show|print)(?:\s+me)?(?:\s+the)?(?:\s+(?:file|contents\s+of))?\s+(?P<path>\S+\.[A-Za-z0-9]{1,8})",
+        ],
+        examples=[
+            "what does my notes.txt file say",
+            "can you read the config file for me",
+            "summarize the contents of this file",
+            "look inside readme.md and tell me about it",
+        ],
+        extract_args=lambda text: {"path": extract_path(text)},
+        required=("path",),
+    ))
+    router.register(Skill(
+        "list_directory",
+        lambda path="": file_ops.list_directory(normalise(path)),
+        patterns=[
+            r"(?:ls|dir)(?:\s+(?P<path>\S+))?",
+            r"(?:please\s+)?(?:list|show)(?:\s+me)?(?:\s+the|\s+all)?\s+(?:files|contents|folders|items)"
+            r"(?:\s+(?:in|of|inside|under)\s+(?:the\s+)?(?P<path>\S+?)(?:\s+(?:folder|directory|dir))?)?",
+            r"what\s+files\s+(?:are|is)\s+in\s+(?:the\s+)?(?P<path>\S+?)(?:\s+(?:folder|directory|dir))?",
+            # Without "files" only an explicit folder/directory suffix makes it a listing ("what is in the box" is chat)
+            r"what(?:'s|\s+is|\s+are)\s+in\s+(?:the\s+|my\s+)?(?P<path>\S+?)\s+(?:folder|directory|dir)",
+        ],
+        examples=[
+            "what files do I have in my home folder",
+            "can you see what is inside my documents directory",
+            "which files are in the turing-os folder",
+            "show me what's in this directory",
+            "list the contents of my downloads",
+        ],
+        extract_args=lambda text: {"path": extract_path(text)},
+    ))
+    router.register(Skill(
+        "shell_translate",
+        translate,
+        patterns=[
+            r"(?:run|cmd|shell|bash)\s*:\s*(?P<intent>.+)",
+            r"(?:what(?:'s|\s+is)\s+the\s+)?(?:bash|terminal|shell|linux)\s+command\s+(?:to|for)\s+(?P<intent>.+)",
+        ],
+        examples=[
+            "how do I check disk space in the terminal",
+            "which command kills the process using port 8080",
+            "how can I find large files from the command line",
+            "terminal command to update all my packages",
+        ],
+        extract_args=lambda text: {"intent": text},
+    ))
+    router.add_chat_examples([
+        "hello how are you",
+        "give me a list of ideas for a birthday party",
+        "make a shopping list for dinner",
+        "what do you think about this plan",
+        "explain how neural networks learn",
+        "write a short poem about the sea",
+        "thanks",
+        "ok",
+    ])
+    router.compile()
+    return router
+
+
+# Test the module
+if __name__ == "__main__":
+    import time
+
+    router = create_default_router()
+    samples = [
+        "list files in turing-os",
+        "what files are in Documents",
+        "read notes.txt",
+        "bash: show free memory",
+        "which files are inside my downloads folder?",
+        "give me a list of three movie ideas",
+        "how do I check disk space in the terminal",
+    ]
+    for sample in samples:
+        match = router.route(sample)
+        label = "chat" if match is None else f"{match.skill.name} {match.args} ({match.via}, {match.confidence:.2f})"
+        print(f"{sample!r:50} -> {label}")
+
+    start = time.perf_counter()
+    rounds = 1000
+    for _ in range(rounds):
+        for sample in samples:
+            router.route(sample)
+    per_call = (time.perf_counter() - start) / (rounds * len(samples))
+    print(f"\nAverage routing latency: {per_call * 1e6:.1f} us")
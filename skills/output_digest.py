@@ -0,0 +1,134 @@
+import re
+import time
+import hashlib
+from collections import deque
+
+# Runs of digits/hex ids are masked so "line 12" and "line 13" count as the same line
+VOLATILE = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+class OutputDigest:
+    def __init__(self, command: str, head_lines=15, tail_lines=15, stderr_lines=30,
+                 max_line_chars=240, max_distinct=4096):
+        """
+        Bounded summary of one command run, built line by line while it streams.
+        Memory and prompt size depend only on the limits, never on how much the command prints:
+        stdout keeps its first distinct lines plus a rolling tail (repeats are only counted),
+        stderr keeps its last lines, and byte/line counts and timings are tracked on the side.
+        """
+        self.command = command
+        self.head_lines = head_lines
+        self.max_line_chars = max_line_chars
+        self.max_distinct = max_distinct
+
+        self.head = []                          # [line, repeats] for the first distinct stdout lines
+        self.tail = deque(maxlen=tail_lines)    # last stdout lines
+        self.stderr_tail = deque(maxlen=stderr_lines)  # [line, repeats]; consecutive repeats are collapsed
+        self._seen = {}                         # masked line hash -> index into head (or -1)
+
+        self.stdout_lines = self.stderr_lines = 0
+        self.stdout_bytes = self.stderr_bytes = 0
+        self.duplicates = 0
+        self.exit_code = None
+
+        self.started = time.monotonic()
+        self.first_output = None
+        self.finished = None
+
+    def _clip(self, line: str) -> str:
+        line = line.rstrip("\r\n")
+        if len(line) > self.max_line_chars:
+            return f"{line[:self.max_line_chars]}... [+{len(line) - self.max_line_chars} chars]"
+        return line
+
+    # ---- Streaming ----
+    def feed_stdout(self, line: str):
+        if self.first_output is None:
+            self.first_output = time.monotonic()
+        self.stdout_lines += 1
+        self.stdout_bytes += len(line)
+        line = self._clip(line)
+        self.tail.append(line)
+
+        key = hashlib.blake2b(VOLATILE.sub("#", line).encode("utf-8", "replace"), digest_size=8).digest()
+        index = self._seen.get(key)
+        if index is not None:
+            self.duplicates += 1
+            if index >= 0:
+                self.head[index][1] += 1
+            return
+        if len(self._seen) < self.max_distinct:
+            # Past the bound new lines are still sampled by the tail, just not deduplicated
+            self._seen[key] = len(self.head) if len(self.head) < self.head_lines else -1
+        if len(self.head) < self.head_lines:
+            self.head.append([line, 0])
+
+    def feed_stderr(self, line: str):
+        if self.first_output is None:
+            self.first_output = time.monotonic()
+        self.stderr_lines += 1
+        self.stderr_bytes += len(line)
+        line = self._clip(line)
+        if self.stderr_tail and self.stderr_tail[-1][0] == line:
+            self.stderr_tail[-1][1] += 1
+        else:
+            self.stderr_tail.append([line, 0])
+
+    def finish(self, exit_code: int):
+        self.exit_code = exit_code
+        self.finished = time.monotonic()
+
+    # ---- Reporting ----
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def failed(self) -> bool:
+        return self.exit_code not in (None, 0)
+
+    def summary(self) -> str:
+        """One-line status shown after every run."""
+        first = f", first output {self.first_output - self.started:.2f}s" if self.first_output else ""
+        return (f"exit {self.exit_code} in {self.duration:.2f}s{first} | "
+                f"stdout {self.stdout_lines} lines ({self.stdout_bytes / 1024:.1f} KB), "
+                f"stderr {self.stderr_lines} lines")
+
+    @staticmethod
+    def _counted(entries) -> list:
+        return [line if not repeats else f"{line}  [x{repeats + 1}]" for line, repeats in entries]
+
+    def render(self) -> str:
+        """The bounded text sent to the LLM instead of the raw output."""
+        parts = [f"$ {self.command}", self.summary()]
+
+        if self.head:
+            parts.append(f"--- stdout: first {len(self.head)} distinct lines ---")
+            parts.extend(self._counted(self.head))
+            # The tail only adds information once stdout outgrew the head sample
+            if self.stdout_lines > len(self.head) + self.duplicates:
+                parts.append(f"--- stdout: last {len(self.tail)} lines ---")
+                parts.extend(self.tail)
+            if self.duplicates:
+                parts.append(f"({self.duplicates} repeated stdout lines omitted)")
+
+        if self.stderr_tail:
+            parts.append(f"--- stderr: tail of {self.stderr_lines} lines ---")
+            parts.extend(self._counted(self.stderr_tail))
+        return "\n".join(parts)
+
+
+# Test the module
+if __name__ == "__main__":
+    digest = OutputDigest("make build")
+    for i in range(200000):
+        digest.feed_stdout(f"compiling unit {i}.o\n")
+    digest.feed_stdout("linking...\n")
+    for i in range(100):
+        digest.feed_stderr(f"warning: unused variable 'x{i}'\n")
+    digest.feed_stderr("error: undefined reference to `main'\n")
+    digest.finish(2)
+
+    text = digest.render()
+    print(text)
+    print(f"\n[{len(text)} chars for {digest.stdout_bytes + digest.stderr_bytes} bytes of output]")
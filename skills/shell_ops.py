@@ -1,29 +1,109 @@
 import sys
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the parent directory to the system path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.llm_engine import TuringLLMEngine
+from core.cache import TuringCache
 
 class ShellAgent:
-    def __init__(self):
-        self.engine = TuringLLMEngine()
+    def __init__(self, engine=None):
+        # Reuse the caller's engine when embedded in another UI (e.g. the sidebar)
+        self.engine = engine if engine is not None else TuringLLMEngine()
+        self._cache = None
 
-    def translate_to_bash(self, natural_language_query: str) -> str:
+    @property
+    def cache(self):
+        # Opened on first use so interactive sessions never touch the SSD for it
+        if self._cache is None:
+            self._cache = TuringCache("shell_commands")
+        return self._cache
+
+    def _cache_key(self, natural_language_query: str) -> str:
+        # Case is kept: paths and arguments are case-sensitive ("Build" is not "build").
+        # The "v2" prefix retires entries written when intents were lowercased
+        return f"v2:{self.engine.model_for('shell')}:{' '.join(natural_language_query.split())}"
+
+    def translate_to_bash(self, natural_language_query: str, use_cache: bool = False) -> str:
         """Translates English to a precise Ubuntu/KDE bash command."""
+        if use_cache:
+            cached = self.cache.get(self._cache_key(natural_language_query))
+            if cached is not None:
+                return cached
+
         prompt = (
             "You are a strict Linux command line translator for Ubuntu/KDE Neon. "
             f"Translate the following user intent into a single, exact bash command: '{natural_language_query}'\n"
             "Respond ONLY with the command itself. Do not include markdown formatting, backticks, or any explanation."
         )
         
-        # We use generate_response for a fast, one-shot translation
-        command = self.engine.generate_response(prompt).strip()
+        # The "shell" profile caps decoding and stops as soon as the command line is complete
+        command = self.engine.generate_response(prompt, profile="shell").strip()
         
         # Clean up in case the LLM disobeys and adds markdown
         if command.startswith("```bash"):
             command = command.replace("```bash", "").replace("```", "").strip()
         elif command.startswith("```"):
             command = command.replace("```", "").strip()
+
+        # Keep only the command line if an explanation slipped through
+        if not command.startswith("[System Error]"):
+            command = command.split("\n", 1)[0].strip()
+
+        if use_cache and command and not command.startswith("[System Error]"):
+            self.cache.set(self._cache_key(natural_language_query), command)
             
-        return command
\ No newline at end of file
+        return command
+
+    def translate_many(self, intents, concurrency: int = None, use_cache: bool = True) -> list:
+        """
+        Translates a batch of intents, up to `concurrency` at a time (defaults to the engine limit).
+        Returns [{"intent", "command", "cached"}] in input order.
+        """
+        intents = list(intents)
+        known = self.cache.get_many(self._cache_key(i) for i in intents) if use_cache else {}
+        results = [
+            {"intent": intent, "command": known.get(self._cache_key(intent)), "cached": self._cache_key(intent) in known}
+            for intent in intents
+        ]
+
+        # Identical intents are only sent to the engine once
+        missing = {}
+        for result in results:
+            if not result["cached"]:
+                missing.setdefault(result["intent"], []).append(result)
+
+        with ThreadPoolExecutor(max_workers=concurrency or self.engine.max_concurrency) as pool:
+            commands = pool.map(lambda intent: self.translate_to_bash(intent, use_cache), missing)
+            for intent, command in zip(missing, commands):
+                for result in missing[intent]:
+                    result["command"] = command
+
+        return results
+
+    def explain_output(self, digest) -> dict:
+        """
+        Explains a finished command run from its bounded OutputDigest (never the raw output).
+        Returns {"explanation", "fix"}; "fix" is a single command or None.
+        """
+        prompt = (
+            "A command was run on Ubuntu/KDE Neon. Below is a digest of the run: the command, exit code, "
+            "timings, a sample of stdout (repeated lines collapsed) and the tail of stderr.\n\n"
+            f"{digest.render()}\n\n"
+            "Explain briefly what happened and, if it failed, the most likely cause. "
+            "Finish with exactly one line 'FIX: <single bash command>' or 'FIX: none'."
+        )
+        response = self.engine.generate_response(prompt, profile="explain").strip()
+        if response.startswith("[System Error]"):
+            return {"explanation": response, "fix": None}
+
+        explanation, fix = response, None
+        match = re.search(r"^\s*FIX:\s*(.*)$", response, re.MULTILINE | re.IGNORECASE)
+        if match:
+            explanation = response[:match.start()].strip()
+            fix = match.group(1).strip().strip("`").strip()
+            if fix.lower() in ("", "none", "n/a"):
+                fix = None
+        return {"explanation": explanation, "fix": fix}
@@ -0,0 +1,259 @@
+import html
+from collections import OrderedDict
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, pyqtSignal
+from PyQt6.QtGui import QTextDocument
+
+ROLE_LABELS = {"user": "User", "turing": "Turing", "system": "Turing OS", "digest": "Memory"}
+
+
+class ChatMessage:
+    __slots__ = ("role", "chunks", "seq", "version")
+
+    def __init__(self, role, text="", seq=None):
+        self.role = role
+        self.chunks = [text] if text else []
+        self.seq = seq
+        self.version = 0  # bumped on every streamed chunk, used as a render-cache key
+
+    def text(self) -> str:
+        if len(self.chunks) > 1:
+            # Collapse the streamed pieces once per read instead of concatenating per token
+            self.chunks = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
+
+
+class ChatHistoryModel(QAbstractListModel):
+    """
+    Holds only a sliding window of the conversation.
+    Older turns are paged in from TuringMemory on demand and dropped again
+    once the window is full, so RAM stays flat however long the session gets.
+    """
+    MessageRole = Qt.ItemDataRole.UserRole + 1
+    row_resized = pyqtSignal()
+
+    def __init__(self, memory=None, session_id=None, window_size=200, page_size=30):
+        super().__init__()
+        self.memory = memory
+        self.session_id = session_id
+        self.window_size = window_size
+        self.page_size = page_size
+        self.messages = []
+        self.oldest_seq = 0      # everything below this seq is still on disk
+        self.has_newer = False   # rows were trimmed from the bottom while browsing history
+        self.streaming = False   # never trim the live tail mid-generation
+
+    # ---- Qt model interface ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.messages)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self.messages[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return message.text()
+        if role == self.MessageRole:
+            return message
+        return None
+
+    # ---- Live conversation ----
+    def append_message(self, role, text="", seq=None):
+        row = len(self.messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.messages.append(ChatMessage(role, text, seq))
+        self.endInsertRows()
+        self._trim_top()
+
+    def append_chunk(self, text_chunk):
+        if not self.messages:
+            return
+        message = self.messages[-1]
+        message.chunks.append(text_chunk)
+        message.version += 1
+        index = self.index(len(self.messages) - 1)
+        self.dataChanged.emit(index, index)
+        self.row_resized.emit()
+
+    # ---- Paging ----
+    def load_tail(self):
+        """Resets the window to the most recent page of the session."""
+        self.beginResetModel()
+        self.messages = []
+        self.has_newer = False
+        self.oldest_seq = 0
+        if self.memory is not None:
+            end = self.memory.next_seq(self.session_id)
+            self.oldest_seq = max(0, end - self.page_size)
+            for seq, role, text in self.memory.load_history(self.session_id, self.oldest_seq, end):
+                self.messages.append(ChatMessage(role, text, seq))
+        self.endResetModel()
+
+    def attach_history(self, boundary_seq: int):
+        """
+        Connects a model that was already in use before memory came online:
+        everything below boundary_seq is older history and gets paged in above.
+        """
+        self.oldest_seq = boundary_seq
+        return self.fetch_older()
+
+    def can_fetch_older(self) -> bool:
+        return self.memory is not None and self.oldest_seq > 0
+
+    def fetch_older(self) -> int:
+        """Prepends the previous page of turns. Returns the number of rows inserted."""
+        if not self.can_fetch_older():
+            return 0
+
+        # Transient system banners have no place above real history
+        while self.messages and self.messages[0].role == "system" and self.messages[0].seq is None:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self.messages.pop(0)
+            self.endRemoveRows()
+
+        start = max(0, self.oldest_seq - self.page_size)
+        rows = self.memory.load_history(self.session_id, start, self.oldest_seq)
+        self.oldest_seq = start
+        if rows:
+            self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+            self.messages[0:0] = [ChatMessage(role, text, seq) for seq, role, text in rows]
+            self.endInsertRows()
+            self._trim_bottom()
+        return len(rows)
+
+    def fetch_newer(self) -> int:
+        """Re-appends turns that were dropped from the bottom while scrolling back."""
+        if self.memory is None or not self.has_newer:
+            return 0
+
+        last_seq = max((m.seq for m in self.messages if m.seq is not None), default=self.oldest_seq - 1)
+        end = self.memory.next_seq(self.session_id)
+        rows = self.memory.load_history(self.session_id, last_seq + 1, min(end, last_seq + 1 + self.page_size))
+        if last_seq + 1 + self.page_size >= end:
+            self.has_newer = False
+        if rows:
+            first = len(self.messages)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.messages.extend(ChatMessage(role, text, seq) for seq, role, text in rows)
+            self.endInsertRows()
+            self._trim_top()
+        return len(rows)
+
+    def _trim_top(self):
+        excess = len(self.messages) - self.window_size
+        if excess <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+        del self.messages[:excess]
+        self.endRemoveRows()
+        first_seq = next((m.seq for m in self.messages if m.seq is not None), None)
+        if first_seq is not None:
+            self.oldest_seq = first_seq
+
+    def _trim_bottom(self):
+        excess = len(self.messages) - self.window_size
+        if excess <= 0 or self.streaming:
+            return
+        first = len(self.messages) - excess
+        self.beginRemoveRows(QModelIndex(), first, len(self.messages) - 1)
+        del self.messages[first:]
+        self.endRemoveRows()
+        self.has_newer = True
+
+
+class ChatBubbleDelegate(QStyledItemDelegate):
+    """Renders one message as rich text; layouts are cached per (message, version, width)."""
+
+    def __init__(self, view, cache_size=64):
+        super().__init__(view)
+        self.view = view
+        self.cache_size = cache_size
+        self._documents = OrderedDict()
+
+    def _document(self, message, width):
+        key = (id(message), message.version, width)
+        cached = self._documents.get(key)
+        # ids can be recycled once a paged-out message is freed, so check identity too
+        if cached is not None and cached[0] is message:
+            self._documents.move_to_end(key)
+            return cached[1]
+
+        label = ROLE_LABELS.get(message.role, message.role.title())
+        body = html.escape(message.text()).replace("\n", "<br>")
+        document = QTextDocument()
+        document.setDefaultFont(self.view.font())
+        document.setDefaultStyleSheet("body { color: #2b2b2b; }")
+        document.setHtml(f"<body><b>{label}:</b> {body}</body>")
+        document.setTextWidth(width)
+
+        self._documents[key] = (message, document)
+        if len(self._documents) > self.cache_size:
+            self._documents.popitem(last=False)
+        return document
+
+    def _width(self):
+        return max(50, self.view.viewport().width() - 4)
+
+    def paint(self, painter, option, index):
+        message = index.data(ChatHistoryModel.MessageRole)
+        document = self._document(message, self._width())
+        painter.save()
+        painter.translate(option.rect.topLeft())
+        document.drawContents(painter)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        message = index.data(ChatHistoryModel.MessageRole)
+        document = self._document(message, self._width())
+        return QSize(self._width(), int(document.size().height()) + 6)
+
+
+class ChatHistoryView(QListView):
+    """Virtualized chat transcript: only rows in the viewport are laid out and painted."""
+
+    def __init__(self, model: ChatHistoryModel):
+        super().__init__()
+        self.setModel(model)
+        self.setItemDelegate(ChatBubbleDelegate(self))
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setUniformItemSizes(False)
+        self.setWordWrap(True)
+
+        self._stick_to_bottom = True
+        model.row_resized.connect(self._on_row_resized)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    def _at_bottom(self) -> bool:
+        bar = self.verticalScrollBar()
+        return bar.value() >= bar.maximum() - 4
+
+    def _on_row_resized(self):
+        # The streaming row grows: relayout is bounded by the window size, not the session
+        self.scheduleDelayedItemsLayout()
+        if self._stick_to_bottom:
+            self.scrollToBottom()
+
+    def _on_rows_inserted(self, parent, first, last):
+        if self._stick_to_bottom and last == self.model().rowCount() - 1:
+            self.scrollToBottom()
+
+    def _on_scrolled(self, value):
+        bar = self.verticalScrollBar()
+        self._stick_to_bottom = self._at_bottom()
+        model = self.model()
+
+        if value == bar.minimum() and model.can_fetch_older():
+            inserted = model.fetch_older()
+            if inserted:
+                # Keep the previously visible top message in place
+                self.scrollTo(model.index(inserted), QAbstractItemView.ScrollHint.PositionAtTop)
+        elif self._stick_to_bottom and model.has_newer:
+            model.fetch_newer()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.scheduleDelayedItemsLayout()
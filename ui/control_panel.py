@@ -4,10 +4,14 @@ import json
 import shutil
 import subprocess
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
-                             QWidget, QLabel, QPushButton, QComboBox, QSlider, QLineEdit, QGraphicsDropShadowEffect, QMessageBox)
+                             QWidget, QLabel, QPushButton, QComboBox, QSlider, QLineEdit, QGraphicsDropShadowEffect, QMessageBox,
+                             QFileDialog)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QColor, QFont
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from memory.chroma_db_manager import resolve_db_path, store_in_use
+
 class ModelPullWorker(QThread):
     progress_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
@@ -28,12 +32,35 @@ class ModelPullWorker(QThread):
         except Exception as e:
             self.finished_signal.emit(False, str(e))
 
+class MemoryTransferWorker(QThread):
+    finished_signal = pyqtSignal(bool, str)
+
+    def __init__(self, action, file_path, db_path):
+        super().__init__()
+        self.action = action
+        self.file_path = file_path
+        self.db_path = db_path
+
+    def run(self):
+        # In a child process, like maintenance: opening the store here would lock it for the panel's lifetime
+        script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "memory", "memory_io.py")
+        try:
+            result = subprocess.run([sys.executable, script, self.action, self.file_path, "--db", self.db_path],
+                                    capture_output=True, text=True)
+            lines = (result.stdout.strip() or result.stderr.strip() or "no output").splitlines()
+            if result.returncode == 0:
+                self.finished_signal.emit(True, lines[-1])
+            else:
+                self.finished_signal.emit(False, f"Memory {self.action} failed: {lines[-1].replace('[System Error] ', '')}")
+        except Exception as e:
+            self.finished_signal.emit(False, f"Memory {self.action} failed: {e}")
+
 class TuringControlPanel(QMainWindow):
     def __init__(self):
         super().__init__()
         self.config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "core", "config.json")
-        self.memory_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "memory", "chroma_data")
         self.config_data = self.load_config()
+        self.memory_path = resolve_db_path(self.config_data.get("memory", {}))
         self.init_ui()
         self.refresh_installed_models()
 
@@ -129,6 +156,23 @@ class TuringControlPanel(QMainWindow):
         self.wipe_memory_btn.clicked.connect(self.wipe_memory)
         self.layout.addWidget(self.wipe_memory_btn)
 
+        self.compact_memory_btn = QPushButton("Digest && Compact Old Memory")
+        self.compact_memory_btn.setStyleSheet("background-color: #6c757d; color: white; padding: 8px; border-radius: 5px; font-weight: bold;")
+        self.compact_memory_btn.clicked.connect(self.compact_memory)
+        self.layout.addWidget(self.compact_memory_btn)
+
+        transfer_row = QHBoxLayout()
+        self.export_memory_btn = QPushButton("Export Memory")
+        self.export_memory_btn.setStyleSheet("background-color: #17a2b8; color: white; padding: 8px; border-radius: 5px;")
+        self.export_memory_btn.clicked.connect(lambda: self.transfer_memory("export"))
+        transfer_row.addWidget(self.export_memory_btn)
+
+        self.import_memory_btn = QPushButton("Import Memory")
+        self.import_memory_btn.setStyleSheet("background-color: #17a2b8; color: white; padding: 8px; border-radius: 5px;")
+        self.import_memory_btn.clicked.connect(lambda: self.transfer_memory("import"))
+        transfer_row.addWidget(self.import_memory_btn)
+        self.layout.addLayout(transfer_row)
+
         # TEMPERATURE
         self.layout.addSpacing(15)
         self.layout.addWidget(QLabel("System Temperature (Precision vs. Creativity):"))
@@ -152,7 +196,16 @@ class TuringControlPanel(QMainWindow):
         btn_layout.addWidget(save_btn)
         self.layout.addLayout(btn_layout)
 
+    def memory_busy(self, action: str) -> bool:
+        """Chroma cannot share a store between processes: refuse while the Sidebar has it open."""
+        if not store_in_use(self.memory_path):
+            return False
+        QMessageBox.warning(self, "Memory In Use",
+                            f"Close the Turing Sidebar before you {action}. It currently has the memory store open.")
+        return True
+
     def wipe_memory(self):
+        if self.memory_busy("wipe memory"): return
         reply = QMessageBox.question(self, 'Confirm Wipe', 'Delete all AI long-term memory?', QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             try:
@@ -162,6 +215,39 @@ class TuringControlPanel(QMainWindow):
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to wipe memory: {e}")
 
+    def compact_memory(self):
+        # Runs detached at idle priority so the panel (and the desktop) stay responsive
+        # (The Sidebar runs the same pass itself once a day while it is open)
+        if self.memory_busy("run maintenance"): return
+        script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "memory", "maintenance.py")
+        try:
+            subprocess.Popen([sys.executable, script], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+            self.status_label.setText("Memory maintenance started in the background (idle priority).")
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to start memory maintenance: {e}")
+
+    def transfer_memory(self, action):
+        if self.memory_busy(f"{action} memory"): return
+        if action == "export":
+            file_path, _ = QFileDialog.getSaveFileName(self, "Export AI Memory", "turing_memory.tmem", "Turing Memory (*.tmem)")
+        else:
+            file_path, _ = QFileDialog.getOpenFileName(self, "Import AI Memory", "", "Turing Memory (*.tmem)")
+        if not file_path: return
+
+        self.export_memory_btn.setDisabled(True)
+        self.import_memory_btn.setDisabled(True)
+        self.status_label.setText(f"Memory {action} in progress...")
+        self.transfer_worker = MemoryTransferWorker(action, file_path, self.memory_path)
+        self.transfer_worker.finished_signal.connect(self.on_transfer_finished)
+        self.transfer_worker.start()
+
+    def on_transfer_finished(self, success, message):
+        self.export_memory_btn.setDisabled(False)
+        self.import_memory_btn.setDisabled(False)
+        self.status_label.setText(message)
+        if not success:
+            QMessageBox.warning(self, "Error", message)
+
     def delete_model(self):
         model = self.model_dropdown.currentText()
         if not model: return
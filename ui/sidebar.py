@@ -1,29 +1,60 @@
 import sys
 import os
+import time
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
-                             QWidget, QLineEdit, QTextBrowser, QPushButton, QGraphicsDropShadowEffect)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+                             QWidget, QLineEdit, QPushButton, QGraphicsDropShadowEffect)
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor, QFont
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.llm_engine import TuringLLMEngine
 from memory.chroma_db_manager import TuringMemory
+from memory.prefetch import SpeculativePrefetcher
+from memory.maintenance import start_background_maintenance, DEFAULT_RETENTION
+from core.cache import TuringCache
+from core.event_bus import DONE, ERROR
+from core.stream_subscribers import MemoryRecorder
 from skills.file_ops import FileOperations
-
-class AIWorker(QThread):
-    token_received = pyqtSignal(str)
-    finished = pyqtSignal()
-
-    def __init__(self, engine, memory, session_id, prompt):
-        super().__init__()
-        self.engine = engine
+from skills.intent_router import create_default_router
+from ui.chat_view import ChatHistoryModel, ChatHistoryView
+from ui.stream_worker import GenerationWorker, shared_bus
+
+# How long the first message may wait for memory that is still booting
+MEMORY_BOOT_WAIT_SECONDS = 2.0
+
+class SidebarWorker(GenerationWorker):
+    def __init__(self, engine, memory, session_id, prompt, router=None, prefetcher=None, seqs=(None, None)):
+        # The finished turn is persisted by the bus's MemoryRecorder, not by this thread
+        meta = {"source": "sidebar", "persist": True, "session_id": session_id, "user_text": prompt, "seqs": seqs}
+        super().__init__(engine, prompt, profile="chat", meta=meta)
         self.memory = memory
         self.session_id = session_id
-        self.prompt = prompt
-        self.full_response = ""
+        self.router = router
+        self.prefetcher = prefetcher
+        self.skill_match = None
+        self.context = None
+
+    def prepare(self):
+        # Reuse the speculative retrieval if the final text is close to what was prefetched.
+        # take() may wait on an in-flight prefetch, so it runs here and never on the GUI thread.
+        if self.prefetcher is not None:
+            self.context, self.skill_match = self.prefetcher.take(self.prompt) or (None, None)
+
+        # SKILL ROUTING (pattern automaton + intent classifier, no LLM involved)
+        if self.skill_match is None and self.router is not None:
+            self.skill_match = self.router.route(self.prompt)
+
+        tool_output = ""
+        if self.skill_match is not None:
+            tool_output = self.skill_match.execute()
+
+            # Exact commands are answered straight from the skill (no LLM round-trip)
+            if self.skill_match.direct:
+                return None, tool_output
 
-    def run(self):
-        context = self.memory.retrieve_context(self.session_id, self.prompt)
+        context = self.context
+        if context is None:
+            context = self.memory.retrieve_context(self.session_id, self.prompt, timeout=MEMORY_BOOT_WAIT_SECONDS)
 
         # STRICT Memory Formatting so the AI doesn't get confused
         augmented_prompt = self.prompt
@@ -34,21 +65,29 @@ class AIWorker(QThread):
                 f"USER'S CURRENT MESSAGE: {self.prompt}"
             )
 
-        for chunk in self.engine.stream_response(augmented_prompt):
-            self.full_response += chunk
-            self.token_received.emit(chunk)
-
-        self.memory.save_memory(self.session_id, "user", self.prompt)
-        self.memory.save_memory(self.session_id, "turing", self.full_response)
-
-        self.finished.emit()
+        if tool_output:
+            # STRICT SYSTEM PROMPT INJECTION to prevent hallucination
+            augmented_prompt += (
+                f"\n\n[SYSTEM OVERRIDE]: You are the Turing AI OS. You HAVE successfully run the "
+                f"'{self.skill_match.skill.name}' tool on the user's machine. Here is its raw output:\n"
+                f"```\n{tool_output}\n```\n"
+                f"INSTRUCTION: Answer the user's message using this data as if you just looked at it."
+            )
+        return augmented_prompt, None
 
 class TuringSidebar(QMainWindow):
-    def __init__(self):
+    def __init__(self, db_path=None):
         super().__init__()
-        self.engine = TuringLLMEngine()
-        self.memory = TuringMemory()
         self.session_id = "default_user_session" # Active chat session
+        self.engine = TuringLLMEngine()
+        # Chroma + the embedding model open on a background thread; the window shows immediately
+        self.memory = TuringMemory(background=True, db_path=db_path, warm_sessions=[self.session_id])
+        self.file_ops = FileOperations()
+        self.router = create_default_router(self.file_ops, self.engine)
+        self.prefetcher = SpeculativePrefetcher(self.memory, self.router, self.session_id)
+        # Every sidebar generation is recorded from the shared stream once it completes
+        self.bus = shared_bus(self.engine)
+        self.recorder = self.bus.subscribe(MemoryRecorder(self.memory), name="memory", kinds=(DONE, ERROR))
         self.init_ui()
 
     def init_ui(self):
@@ -78,12 +117,20 @@ class TuringSidebar(QMainWindow):
         shadow.setOffset(5, 0)
         self.central_widget.setGraphicsEffect(shadow)
 
-        self.chat_history = QTextBrowser()
+        # Virtualized transcript: only a window of turns lives in RAM, older ones page in on scroll
+        self.chat_model = ChatHistoryModel(self.memory, self.session_id)
+        self.chat_history = ChatHistoryView(self.chat_model)
         self.chat_history.setFont(QFont("Inter", 12))
         self.chat_history.setStyleSheet("background: transparent; border: none; color: #2b2b2b;")
-        self.chat_history.append("<b>Turing OS:</b> Core systems online. My memory modules are active.")
+        self.chat_model.append_message("system", "Core systems online. My memory modules are warming up.")
         self.layout.addWidget(self.chat_history)
 
+        # Page in past history once memory is online
+        self.memory_poll = QTimer(self)
+        self.memory_poll.setInterval(100)
+        self.memory_poll.timeout.connect(self.check_memory_ready)
+        self.memory_poll.start()
+
         input_layout = QHBoxLayout()
         self.chat_input = QLineEdit()
         self.chat_input.setPlaceholderText("Type a message...")
@@ -94,6 +141,13 @@ class TuringSidebar(QMainWindow):
         self.chat_input.returnPressed.connect(self.process_query)
         input_layout.addWidget(self.chat_input)
 
+        # Debounced speculative retrieval while the user is still typing
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(250)
+        self.prefetch_timer.timeout.connect(self.prefetch_context)
+        self.chat_input.textChanged.connect(self.prefetch_timer.start)
+
         self.send_button = QPushButton("Send")
         self.send_button.setStyleSheet("""
             QPushButton { background-color: rgba(0, 120, 215, 200); color: white; border-radius: 10px; padding: 10px; font-weight: bold; }
@@ -104,56 +158,72 @@ class TuringSidebar(QMainWindow):
 
         self.layout.addLayout(input_layout)
 
+    def check_memory_ready(self):
+        if not self.memory.ready.done():
+            return
+        self.memory_poll.stop()
+        if self.memory.is_ready():
+            self.chat_model.attach_history(self.memory.boot_seq.get(self.session_id, 0))
+            self.chat_model.append_message("system", f"Memory modules active ({self.memory.open_seconds:.1f}s).")
+            self.schedule_maintenance()
+        else:
+            self.chat_model.append_message("system", f"Memory offline: {self.memory.ready.exception()}")
+
+    def schedule_maintenance(self):
+        """Digests/evicts old memories on an idle-priority thread, at most once per interval."""
+        state = TuringCache("maintenance")
+        interval = self.engine.config.get("memory", {}).get("retention", {}).get(
+            "interval_hours", DEFAULT_RETENTION["interval_hours"])
+        if time.time() - state.get("last_run", 0) < interval * 3600:
+            return
+
+        def on_done(report):
+            if "error" not in report:
+                state.set("last_run", time.time())
+            print(f"[Memory Maintenance] {report}")
+
+        start_background_maintenance(self.memory, self.engine, on_done)
+
+    def prefetch_context(self):
+        partial_text = self.chat_input.text().strip()
+        if len(partial_text) < 3 or self.chat_input.isReadOnly():
+            return
+        self.prefetcher.schedule(partial_text)
+
     def process_query(self):
         user_text = self.chat_input.text().strip()
         if not user_text: return
         if user_text.lower() in ["exit", "quit", "close"]: QApplication.quit()
 
-        self.chat_history.append(f"<br><b>User:</b> {user_text}")
-        self.chat_history.append("<b>Turing:</b> ")
+        # Jump back to the live tail if the user was browsing old history
+        if self.chat_model.has_newer:
+            self.chat_model.load_tail()
+
+        # Before memory is online the worker assigns the slots itself when it saves
+        seqs = (None, None)
+        if self.memory.is_ready():
+            seqs = (self.memory.reserve_seq(self.session_id), self.memory.reserve_seq(self.session_id))
+        self.chat_model.append_message("user", user_text, seq=seqs[0])
+        self.chat_model.append_message("turing", "", seq=seqs[1])
+        self.chat_model.streaming = True
+        self.chat_history.scrollToBottom()
         self.chat_input.clear()
         self.chat_input.setReadOnly(True)
         self.send_button.setDisabled(True)
 
-        from skills.file_ops import FileOperations
-        file_ops = FileOperations()
-
-        system_injection = ""
-
-        # NATURAL LANGUAGE PARSING
-        lower_text = user_text.lower()
-
-        if "what files" in lower_text or "list" in lower_text:
-            # Try to extract a folder name, default to home if none found
-            path = ""
-            if "turing-os" in lower_text:
-                path = "turing-os"
-
-            dir_contents = file_ops.list_directory(path)
-
-            # STRICT SYSTEM PROMPT INJECTION to prevent hallucination
-            system_injection = (
-                f"\n\n[SYSTEM OVERRIDE]: You are the Turing AI OS. You HAVE successfully scanned the user's hard drive. "
-                f"Here is the raw data from the '{path}' directory:\n"
-                f"```\n{dir_contents}\n```\n"
-                f"INSTRUCTION: Describe these files to the user as if you just looked at them."
-            )
-
-        # Combine the user's text with the secret system injection
-        final_prompt = user_text + system_injection
-
-        self.worker = AIWorker(self.engine, self.memory, self.session_id, final_prompt)
+        # Prefetch pickup and skill routing happen on the worker thread
+        self.prefetch_timer.stop()
+        self.worker = SidebarWorker(self.engine, self.memory, self.session_id, user_text,
+                                    self.router, self.prefetcher, seqs)
         self.worker.token_received.connect(self.update_output)
         self.worker.finished.connect(self.generation_complete)
         self.worker.start()
 
     def update_output(self, text_chunk):
-        cursor = self.chat_history.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.insertText(text_chunk)
-        self.chat_history.setTextCursor(cursor)
+        self.chat_model.append_chunk(text_chunk)
 
     def generation_complete(self):
+        self.chat_model.streaming = False
         self.chat_input.setReadOnly(False)
         self.send_button.setDisabled(False)
         self.chat_input.setFocus()
@@ -165,5 +235,12 @@ class TuringSidebar(QMainWindow):
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     sidebar = TuringSidebar()
+    app.aboutToQuit.connect(lambda: print(
+        f"[Prefetch] hits={sidebar.prefetcher.stats['hits']} misses={sidebar.prefetcher.stats['misses']} "
+        f"cancelled={sidebar.prefetcher.stats['cancelled']} hit_rate={sidebar.prefetcher.hit_rate():.0%}"
+    ))
+    app.aboutToQuit.connect(sidebar.prefetcher.shutdown)
+    # Let turns that are still being recorded reach the SSD
+    app.aboutToQuit.connect(lambda: sidebar.recorder.close(wait=True))
     sidebar.show()
     sys.exit(app.exec())
@@ -2,25 +2,12 @@ import sys
 import os
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, 
                              QWidget, QLineEdit, QTextBrowser, QGraphicsDropShadowEffect)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QFont
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.llm_engine import TuringLLMEngine
-
-class AIWorker(QThread):
-    token_received = pyqtSignal(str)
-    finished = pyqtSignal()
-
-    def __init__(self, engine, prompt):
-        super().__init__()
-        self.engine = engine
-        self.prompt = prompt
-
-    def run(self):
-        for chunk in self.engine.stream_response(self.prompt):
-            self.token_received.emit(chunk)
-        self.finished.emit()
+from ui.stream_worker import GenerationWorker
 
 class TuringSpotlight(QMainWindow):
     def __init__(self):
@@ -83,7 +70,7 @@ class TuringSpotlight(QMainWindow):
         self.output_area.clear()
         self.resize(800, 400) 
 
-        self.worker = AIWorker(self.engine, prompt)
+        self.worker = GenerationWorker(self.engine, prompt, profile="spotlight", meta={"source": "spotlight"})
         self.worker.token_received.connect(self.update_output)
         self.worker.finished.connect(self.generation_complete)
         self.worker.start()
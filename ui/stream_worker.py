@@ -0,0 +1,88 @@
+import os
+import sys
+import math
+import uuid
+import threading
+from PyQt6.QtCore import QThread, pyqtSignal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.event_bus import get_event_bus, stream_generation, TOKENS, DONE, ERROR
+from core.stream_subscribers import attach_default_subscribers
+
+_tracers_lock = threading.Lock()
+_tracers_attached = False
+
+
+def shared_bus(engine):
+    """The process-wide bus, with the tracers from config.json attached on first use."""
+    global _tracers_attached
+    settings = engine.config.get("streaming", {})
+    bus = get_event_bus(settings)
+    with _tracers_lock:
+        if not _tracers_attached:
+            attach_default_subscribers(bus, settings)
+            _tracers_attached = True
+    return bus
+
+
+class GenerationWorker(QThread):
+    """
+    Shared streaming worker for every window. The generation is published on the event bus;
+    this worker is just its Qt subscriber, so the tracer and memory recorder see the same stream.
+    At most `max_in_flight` token batches wait in the Qt event loop: a busy UI slows delivery
+    instead of queueing an unbounded backlog.
+    """
+    token_received = pyqtSignal(str)
+    generation_event = pyqtSignal(object)
+    _deliver = pyqtSignal(object)
+
+    def __init__(self, engine, prompt=None, profile="chat", meta=None, bus=None, max_in_flight=8):
+        super().__init__()
+        self.engine = engine
+        self.prompt = prompt
+        self.profile = profile
+        self.meta = meta or {}
+        self.bus = bus if bus is not None else shared_bus(engine)
+        self.generation_id = uuid.uuid4().hex[:12]
+        self.result = None
+
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._delivered = threading.Event()
+        # Emitted from the bus thread, received on the GUI thread (queued connection)
+        self._deliver.connect(self._on_deliver)
+
+    def prepare(self):
+        """
+        Runs on the worker thread before generation. Returns (prompt, direct_text):
+        direct_text, when set, is published as the answer without calling the LLM.
+        """
+        return self.prompt, None
+
+    def run(self):
+        subscription = self.bus.subscribe(self._forward, name=f"qt-{self.generation_id}",
+                                          generation_id=self.generation_id, block_timeout=math.inf)
+        try:
+            prompt, direct_text = self.prepare()
+        except Exception as e:
+            prompt, direct_text = None, f"[System Error] {e}"
+
+        self.result = stream_generation(self.bus, self.engine, prompt, self.profile, self.meta,
+                                        generation_id=self.generation_id, direct_text=direct_text)
+
+        # QThread.finished must not overtake the last tokens on their way to the GUI
+        self._delivered.wait()
+        subscription.close()
+
+    def _forward(self, event):
+        self._in_flight.acquire()
+        self._deliver.emit(event)
+        if event.kind in (DONE, ERROR):
+            self._delivered.set()
+
+    def _on_deliver(self, event):
+        self._in_flight.release()
+        if event.kind == TOKENS:
+            self.token_received.emit(event.data["text"])
+        elif event.kind == ERROR:
+            self.token_received.emit(event.data["error"])
+        self.generation_event.emit(event)
@@ -1,28 +1,133 @@
 import sys
 import os
+import json
+import tty
+import queue
+import termios
+import argparse
+import threading
 import subprocess
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.panel import Panel
+from rich.table import Table
 from rich.text import Text
+from rich.markup import escape
 
 # Add the parent directory to the system path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from skills.shell_ops import ShellAgent
+from skills.output_digest import OutputDigest
 
 console = Console()
 
 def clear_screen():
     os.system('clear')
 
+def _pump(stream, name: str, lines: queue.Queue):
+    """Reader thread: forwards one pipe line by line (bounded reads, so huge lines can't exhaust RAM)."""
+    for line in iter(lambda: stream.readline(8192), ""):
+        lines.put((name, line))
+    stream.close()
+    lines.put((name, None))
+
+def run_command(bash_command: str, digest: OutputDigest = None) -> int:
+    """
+    Runs a command in the OS, streaming its output. Returns the exit code.
+    stdout and stderr are drained concurrently, so a command that fills one pipe
+    while we wait on the other can no longer stall. If a digest is given it is fed as lines arrive.
+    """
+    process = subprocess.Popen(bash_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, errors="replace")
+
+    # Bounded hand-off: a command that prints faster than the terminal renders is throttled, not buffered
+    lines = queue.Queue(maxsize=1024)
+    for stream, name in ((process.stdout, "stdout"), (process.stderr, "stderr")):
+        threading.Thread(target=_pump, args=(stream, name, lines), daemon=True).start()
+
+    open_streams = 2
+    while open_streams:
+        # Drain whatever is queued and print it in runs per stream: one render call per run, not per line
+        pending = [lines.get()]
+        while len(pending) < 512:
+            try:
+                pending.append(lines.get_nowait())
+            except queue.Empty:
+                break
+
+        run_name, run = None, []
+        for name, line in pending + [(None, None)]:
+            if run and name != run_name:
+                style = "bold red" if run_name == "stderr" else None
+                console.print("".join(run), end="", style=style, markup=False, highlight=False)
+                run = []
+            if line is None:
+                if name is not None:
+                    open_streams -= 1
+                continue
+            run_name = name
+            run.append(line)
+            if digest is not None:
+                (digest.feed_stdout if name == "stdout" else digest.feed_stderr)(line)
+
+    exit_code = process.wait()
+    if digest is not None:
+        digest.finish(exit_code)
+    return exit_code
+
+def read_key(message: str) -> str:
+    """Single keypress prompt (falls back to a line read when not on a terminal)."""
+    console.print(message, end="")
+    if not sys.stdin.isatty():
+        return sys.stdin.readline().strip().lower()[:1]
+    fd = sys.stdin.fileno()
+    settings = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        key = sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, settings)
+    console.print()
+    return key.lower()
+
+def explain_run(agent: ShellAgent, digest: OutputDigest):
+    """Sends only the run's digest to the LLM. Returns a fix command the user approved, or None."""
+    with console.status("[bold cyan]Analysing command output...", spinner="dots"):
+        result = agent.explain_output(digest)
+    console.print(Panel(Text(result["explanation"]), title="Explanation", expand=False, border_style="yellow"))
+
+    if not result["fix"]:
+        return None
+    console.print(f"\n[bold yellow]Proposed Fix:[/bold yellow] [bold white on black] {escape(result['fix'])} [/bold white on black]")
+    confirm = Prompt.ask("[bold red]Execute this command?[/bold red] (y/n)", choices=["y", "n"], default="n")
+    return result["fix"] if confirm == "y" else None
+
+def execute_with_triage(agent: ShellAgent, bash_command: str) -> OutputDigest:
+    """Runs a command, keeps its digest and offers a one-key explain/fix when it fails."""
+    while True:
+        console.print(f"Executing: {bash_command}\n", style="dim", markup=False, highlight=False)
+        digest = OutputDigest(bash_command)
+        run_command(bash_command, digest)
+        console.print(digest.summary(), style="dim", markup=False, highlight=False)
+
+        if not digest.failed:
+            return digest
+        if read_key("[bold yellow]Command failed.[/bold yellow] Press [bold]e[/bold] to explain/fix, any other key to continue ") != "e":
+            return digest
+        fix = explain_run(agent, digest)
+        if not fix:
+            return digest
+        bash_command = fix
+
 def main_loop():
     clear_screen()
     print("\033]0;Turing AI Terminal\007", end="")
     agent = ShellAgent()
+    last_run = None
     
     # Welcome Banner
     welcome_text = Text("Turing AI Shell [Version 1.0]\n", style="bold cyan")
-    welcome_text.append("Natural Language Terminal interface. Type 'exit' to return to legacy bash.", style="dim")
+    welcome_text.append("Natural Language Terminal interface. Type 'explain' to analyse the last run, 'exit' to return to legacy bash.", style="dim")
     console.print(Panel(welcome_text, title="System Core", expand=False, border_style="cyan"))
 
     while True:
@@ -39,30 +144,28 @@ def main_loop():
             if user_input.lower() == 'clear':
                 clear_screen()
                 continue
+            if user_input.lower() in ['explain', '?']:
+                if last_run is None:
+                    console.print("[yellow]Nothing has been executed yet.[/yellow]")
+                    continue
+                fix = explain_run(agent, last_run)
+                if fix:
+                    last_run = execute_with_triage(agent, fix)
+                continue
 
             # 1. Show thinking state
             with console.status("[bold cyan]Translating intent to system command...", spinner="dots"):
                 bash_command = agent.translate_to_bash(user_input)
             
             # 2. Safety Check (Explain-before-execute)
-            console.print(f"\n[bold yellow]Proposed Command:[/bold yellow] [bold white on black] {bash_command} [/bold white on black]")
+            console.print(f"\n[bold yellow]Proposed Command:[/bold yellow] [bold white on black] {escape(bash_command)} [/bold white on black]")
             
             confirm = Prompt.ask("[bold red]Execute this command?[/bold red] (y/n)", choices=["y", "n"], default="n")
             
             # 3. Execution
             if confirm == 'y':
-                console.print(f"[dim]Executing: {bash_command}[/dim]\n")
-                
-                # Run command directly in the OS and stream output
-                process = subprocess.Popen(bash_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                
-                # Read output line by line so it feels like a real terminal
-                for line in process.stdout:
-                    console.print(line, end="")
-                for err_line in process.stderr:
-                    console.print(f"[bold red]{err_line}[/bold red]", end="")
-                    
-                process.wait()
+                # Run command directly in the OS, stream output and keep a bounded digest of the run
+                last_run = execute_with_triage(agent, bash_command)
             else:
                 console.print("[yellow]Action Cancelled.[/yellow]")
 
@@ -72,5 +175,105 @@ def main_loop():
         except Exception as e:
             console.print(f"\n[bold red]System Error:[/bold red] {str(e)}")
 
+def read_intents(source: str) -> list:
+    """One intent per line; blank lines and '#' comments are ignored."""
+    handle = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        lines = [line.strip() for line in handle]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    return [line for line in lines if line and not line.startswith("#")]
+
+def translation_failed(result: dict) -> bool:
+    return not result["command"] or result["command"].startswith("[System Error]")
+
+def write_plan(results: list, output: str):
+    """
+    Writes the proposed commands as a reviewable bash script or as JSONL.
+    Failed translations only appear as comments, so the script never runs an error message.
+    """
+    with open(output, "w", encoding="utf-8") as f:
+        if output.endswith(".jsonl"):
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+            return
+
+        f.write("#!/usr/bin/env bash\n")
+        f.write("# Generated by Turing AI Shell batch mode. Review every line before running.\n")
+        f.write("set -e\n")
+        for result in results:
+            if translation_failed(result):
+                reason = " ".join(str(result["command"] or "no command returned").split())
+                f.write(f"\n# intent: {result['intent']}\n# FAILED: {reason}\n")
+            else:
+                f.write(f"\n# intent: {result['intent']}\n{result['command']}\n")
+    if not output.endswith(".jsonl"):
+        os.chmod(output, 0o755)
+
+def batch_mode(args) -> int:
+    intents = read_intents(args.batch)
+    if not intents:
+        console.print("[yellow]No intents to translate.[/yellow]")
+        return 1
+
+    agent = ShellAgent()
+    concurrency = args.concurrency or agent.engine.max_concurrency
+    with console.status(f"[bold cyan]Translating {len(intents)} intents ({concurrency} at a time)...", spinner="dots"):
+        results = agent.translate_many(intents, concurrency, use_cache=not args.no_cache)
+
+    # Review table
+    table = Table(title="Proposed Commands", border_style="cyan")
+    table.add_column("#", style="dim")
+    table.add_column("Intent")
+    table.add_column("Command", style="bold white")
+    table.add_column("", style="dim")
+    for index, result in enumerate(results, start=1):
+        # Text() keeps brackets in LLM output from being read as Rich markup
+        table.add_row(str(index), Text(result["intent"]), Text(str(result["command"])), "cached" if result["cached"] else "")
+    console.print(table)
+
+    failed = [r for r in results if translation_failed(r)]
+    if args.output:
+        write_plan(results, args.output)
+        console.print(f"[green]Plan written to {args.output}[/green]")
+
+    if not args.execute:
+        return 0
+    if failed:
+        console.print(f"[bold red]{len(failed)} intents could not be translated. Refusing to execute.[/bold red]")
+        return 1
+
+    # A single bulk approval. Intents may have come from stdin, so ask on the terminal itself.
+    try:
+        terminal = sys.stdin if sys.stdin.isatty() else open("/dev/tty", "r")
+    except OSError:
+        console.print("[bold red]No terminal available to confirm execution. Write a plan with -o and run it yourself.[/bold red]")
+        return 1
+    confirm = Prompt.ask(f"[bold red]Execute all {len(results)} commands in order?[/bold red] (y/n)",
+                         choices=["y", "n"], default="n", stream=terminal)
+    if confirm != "y":
+        console.print("[yellow]Action Cancelled.[/yellow]")
+        return 0
+
+    for index, result in enumerate(results, start=1):
+        console.print(f"\n[{index}/{len(results)}] Executing: {result['command']}", style="dim", markup=False, highlight=False)
+        exit_code = run_command(result["command"])
+        if exit_code != 0 and not args.keep_going:
+            console.print(f"[bold red]Stopped: command {index} exited with {exit_code}.[/bold red]")
+            return exit_code
+    return 0
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Turing AI Shell - natural language terminal.")
+    parser.add_argument("--batch", metavar="FILE", help="Translate intents from FILE (one per line, '-' for stdin) instead of running interactively")
+    parser.add_argument("-o", "--output", help="Write the proposed commands to a .sh script or a .jsonl file")
+    parser.add_argument("--execute", action="store_true", help="Run all commands after a single confirmation")
+    parser.add_argument("--keep-going", action="store_true", help="Continue executing after a failing command")
+    parser.add_argument("--concurrency", type=int, default=None, help="Simultaneous translations (defaults to model.max_concurrency)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the persistent intent-to-command cache")
+    cli_args = parser.parse_args()
+
+    if cli_args.batch:
+        sys.exit(batch_mode(cli_args))
     main_loop()
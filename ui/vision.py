@@ -2,25 +2,12 @@ import sys
 import os
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, 
                              QWidget, QLabel, QTextBrowser, QPushButton, QGraphicsDropShadowEffect)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QFont
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.llm_engine import TuringLLMEngine
-
-class AIWorker(QThread):
-    token_received = pyqtSignal(str)
-    finished = pyqtSignal()
-
-    def __init__(self, engine, prompt):
-        super().__init__()
-        self.engine = engine
-        self.prompt = prompt
-
-    def run(self):
-        for chunk in self.engine.stream_response(self.prompt):
-            self.token_received.emit(chunk)
-        self.finished.emit()
+from ui.stream_worker import GenerationWorker
 
 class TuringVision(QMainWindow):
     def __init__(self, target_path):
@@ -105,7 +92,7 @@ class TuringVision(QMainWindow):
             self.output_area.setText(f"<b style='color:red;'>File Error:</b> {str(e)}<br>This might not be a readable text file.")
 
     def start_worker(self, prompt):
-        self.worker = AIWorker(self.engine, prompt)
+        self.worker = GenerationWorker(self.engine, prompt, profile="vision", meta={"source": "vision", "target": self.target_path})
         self.worker.token_received.connect(self.update_output)
         self.worker.start()
 
@@ -119,6 +106,11 @@ if __name__ == '__main__':
     if len(sys.argv) < 2:
         print("Error: No file or folder path provided.")
         sys.exit(1)
+
+    # Headless mode: python ui/vision.py --batch <files/folders/globs> [-o report.jsonl]
+    if sys.argv[1] == "--batch":
+        from ui.vision_batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
         
     app = QApplication(sys.argv)
     vision = TuringVision(sys.argv[1])
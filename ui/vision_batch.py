@@ -0,0 +1,266 @@
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# Add the parent directory to the system path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.cache import TuringCache
+
+# Bump when the prompts change so stale summaries are not reused
+PROMPT_VERSION = 1
+
+CHUNK_CHARS = 2000          # Same window the interactive Vision reads per file
+MAX_FILE_BYTES = 2_000_000  # Skip huge blobs (logs, datasets) outright
+TOO_LARGE = "File too large to summarize"
+BINARY = "Binary file skipped"
+SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv", ".mypy_cache", ".pytest_cache"}
+
+
+def collect_targets(inputs) -> list:
+    """Expands files, folders (recursively) and glob patterns into a sorted list of files."""
+    found = set()
+    for item in inputs:
+        item = os.path.expanduser(item)
+        matches = glob.glob(item, recursive=True) if glob.has_magic(item) else [item]
+        for match in matches:
+            if os.path.isdir(match):
+                for root, dirs, files in os.walk(match):
+                    dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+                    for name in files:
+                        found.add(os.path.abspath(os.path.join(root, name)))
+            elif os.path.isfile(match):
+                found.add(os.path.abspath(match))
+    return sorted(found)
+
+
+def chunk_text(text: str, size: int = CHUNK_CHARS, max_chunks: int = 4) -> list:
+    """Splits text into <= max_chunks pieces of ~size chars, preferring line boundaries."""
+    chunks = []
+    start = 0
+    while start < len(text) and len(chunks) < max_chunks:
+        end = min(len(text), start + size)
+        if end < len(text):
+            newline = text.rfind("\n", start + size // 2, end)
+            if newline != -1:
+                end = newline + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def extract_file(path: str, max_chunks: int = 4) -> dict:
+    """
+    Runs inside the process pool: hash, sniff and chunk one file.
+    Returns a plain dict so it pickles cheaply back to the parent.
+    """
+    record = {"path": path, "sha256": None, "bytes": 0, "chunks": [], "error": None}
+    try:
+        stat = os.stat(path)
+        record["bytes"] = stat.st_size
+        if stat.st_size > MAX_FILE_BYTES:
+            record["error"] = TOO_LARGE
+            return record
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        record["sha256"] = hashlib.sha256(raw).hexdigest()
+
+        if b"\x00" in raw[:1024]:
+            record["error"] = BINARY
+            return record
+
+        record["chunks"] = chunk_text(raw.decode("utf-8", errors="replace"), max_chunks=max_chunks)
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+
+class VisionBatch:
+    def __init__(self, engine, workers=None, concurrency=None, max_chunks=4, use_cache=True):
+        """
+        Headless Turing Vision over many files.
+        - workers: processes used for reading/hashing/chunking
+        - concurrency: simultaneous LLM requests (defaults to the engine's limit)
+        """
+        self.engine = engine
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.concurrency = concurrency or engine.max_concurrency
+        self.max_chunks = max_chunks
+        self.cache = TuringCache("vision_summaries") if use_cache else None
+
+    def _summary_key(self, sha256: str) -> str:
+        return f"{self.engine.model_for('vision')}:{self.engine.model_for('vision_chunk')}:{PROMPT_VERSION}:{self.max_chunks}:{sha256}"
+
+    @staticmethod
+    def _stat_key(path: str):
+        # Path + size + mtime lets unchanged files skip even the read/hash step.
+        # The value is the file's sha256, or {"skipped": reason} for binaries and oversized files
+        try:
+            stat = os.stat(path)
+            return f"stat:{path}:{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            return None
+
+    def summarize(self, record: dict) -> str:
+        """Summarizes each chunk, then folds multi-chunk files into one answer."""
+        name = os.path.basename(record["path"])
+        chunks = record["chunks"]
+        if not chunks or not "".join(chunks).strip():
+            return "Empty file."
+
+        if len(chunks) == 1:
+            return self.engine.generate_response(
+                f"Please provide a concise summary and explain the purpose of the following file contents ({name}):\n\n{chunks[0]}",
+                profile="vision"
+            ).strip()
+
+        partials = []
+        for index, chunk in enumerate(chunks, start=1):
+            partials.append(self.engine.generate_response(
+                f"Summarize part {index}/{len(chunks)} of the file '{name}' in 2-3 sentences:\n\n{chunk}",
+                profile="vision_chunk"
+            ).strip())
+            if partials[-1].startswith("[System Error]"):
+                return partials[-1]
+
+        joined = "\n".join(f"- {p}" for p in partials)
+        return self.engine.generate_response(
+            f"Combine these partial summaries of '{name}' into one concise summary that explains its purpose:\n\n{joined}",
+            profile="vision"
+        ).strip()
+
+    def run(self, paths, on_result=None) -> list:
+        """Processes every path and returns the report records (also passed to on_result as they finish)."""
+        results = []
+
+        def emit(record):
+            results.append(record)
+            if on_result:
+                on_result(record)
+
+        # 1. Fast path: unchanged files resolved straight from the cache
+        pending = []
+        stat_keys = {path: self._stat_key(path) for path in paths}
+        known = self.cache.get_many(k for k in stat_keys.values() if k) if self.cache is not None else {}
+        hashes = [h for h in known.values() if isinstance(h, str)]
+        cached = self.cache.get_many(self._summary_key(h) for h in hashes) if self.cache is not None else {}
+        for path in paths:
+            sha256 = known.get(stat_keys[path])
+            if isinstance(sha256, dict):
+                # Unchanged binary or oversized file: skipped again without reading it
+                emit({"path": path, "sha256": sha256.get("sha256"), "summary": None, "cached": True,
+                      "seconds": 0.0, "error": sha256["skipped"]})
+                continue
+            summary = cached.get(self._summary_key(sha256)) if sha256 else None
+            if summary is not None:
+                emit({"path": path, "sha256": sha256, "summary": summary, "cached": True, "seconds": 0.0, "error": None})
+            else:
+                pending.append(path)
+
+        if not pending:
+            return results
+
+        # 2. Extraction in a process pool, LLM calls on a bounded thread pool
+        with ProcessPoolExecutor(max_workers=self.workers) as processes, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as llm_pool:
+            llm_jobs = {}
+            extract_jobs = [processes.submit(extract_file, path, self.max_chunks) for path in pending]
+
+            for job in as_completed(extract_jobs):
+                record = job.result()
+                report = {"path": record["path"], "sha256": record["sha256"], "summary": None,
+                          "cached": False, "seconds": 0.0, "error": record["error"]}
+
+                stat_key = stat_keys.get(record["path"])
+                if self.cache is not None and stat_key:
+                    if record["error"] in (TOO_LARGE, BINARY):
+                        self.cache.set(stat_key, {"skipped": record["error"], "sha256": record["sha256"]})
+                    elif record["sha256"]:
+                        self.cache.set(stat_key, record["sha256"])
+
+                if record["error"]:
+                    emit(report)
+                    continue
+
+                summary = self.cache.get(self._summary_key(record["sha256"])) if self.cache is not None else None
+                if summary is not None:
+                    # Content seen before under another path or mtime
+                    report["summary"], report["cached"] = summary, True
+                    emit(report)
+                    continue
+
+                llm_jobs[llm_pool.submit(self._timed_summary, record)] = report
+
+            for job in as_completed(llm_jobs):
+                report = llm_jobs[job]
+                summary, seconds = job.result()
+                report["seconds"] = round(seconds, 3)
+                if summary.startswith("[System Error]"):
+                    report["error"] = summary
+                else:
+                    report["summary"] = summary
+                    if self.cache is not None:
+                        self.cache.set(self._summary_key(report["sha256"]), summary)
+                emit(report)
+
+        return results
+
+    def _timed_summary(self, record):
+        start = time.perf_counter()
+        summary = self.summarize(record)
+        return summary, time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="vision.py --batch",
+        description="Summarize many files headlessly with Turing Vision."
+    )
+    parser.add_argument("paths", nargs="+", help="Files, folders or glob patterns (e.g. 'src/**/*.py')")
+    parser.add_argument("-o", "--output", default="vision_report.jsonl",
+                        help="Report file: .jsonl streams one record per file, .json writes a single array")
+    parser.add_argument("--workers", type=int, default=None, help="Processes used for reading and chunking")
+    parser.add_argument("--concurrency", type=int, default=None, help="Simultaneous LLM requests")
+    parser.add_argument("--max-chunks", type=int, default=4, help="Chunks summarized per file")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the summary cache")
+    args = parser.parse_args(argv)
+
+    paths = collect_targets(args.paths)
+    if not paths:
+        print("Error: No files matched.")
+        return 1
+
+    from core.llm_engine import TuringLLMEngine
+    batch = VisionBatch(TuringLLMEngine(), args.workers, args.concurrency, args.max_chunks, not args.no_cache)
+
+    as_jsonl = not args.output.endswith(".json")
+    started = time.perf_counter()
+    done = [0]
+
+    with open(args.output, "w", encoding="utf-8") as report_file:
+        def on_result(record):
+            done[0] += 1
+            state = "cached" if record["cached"] else ("error" if record["error"] else f"{record['seconds']}s")
+            print(f"[{done[0]}/{len(paths)}] {record['path']} ({state})", file=sys.stderr)
+            if as_jsonl:
+                report_file.write(json.dumps(record) + "\n")
+                report_file.flush()
+
+        results = batch.run(paths, on_result)
+        if not as_jsonl:
+            json.dump(sorted(results, key=lambda r: r["path"]), report_file, indent=2)
+
+    hits = sum(1 for r in results if r["cached"])
+    errors = sum(1 for r in results if r["error"])
+    print(f"Processed {len(results)} files in {time.perf_counter() - started:.1f}s "
+          f"({hits} cached, {errors} errors) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())